@@ -1,8 +1,6 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
 
 # 모듈화된 함수들 import
 from scm.config import DEFAULT_CONFIG
@@ -25,6 +23,15 @@ st.set_page_config(
     layout="wide"
 )
 
+# rerun마다 정규화를 반복하지 않도록 원본 DF 기준으로 결과를 캐시
+@st.cache_data(ttl=300)
+def _normalize_snap_cached(df: pd.DataFrame) -> pd.DataFrame:
+    return normalize_refined_snapshot(df)
+
+@st.cache_data(ttl=300)
+def _normalize_moves_cached(df: pd.DataFrame) -> pd.DataFrame:
+    return normalize_moves(df)
+
 st.title("📊 SCM 재고 흐름 대시보드 (모듈화 버전)")
 st.caption("글로벌 공급망 관리를 위한 재고 흐름 시각화")
 
@@ -87,8 +94,8 @@ elif data_source == "Google Sheets":
 
 # 데이터 정규화
 try:
-    snap_long = normalize_refined_snapshot(snap_raw)
-    moves = normalize_moves(moves_raw)
+    snap_long = _normalize_snap_cached(snap_raw)
+    moves = _normalize_moves_cached(moves_raw)
     
     st.success("데이터가 성공적으로 정규화되었습니다!")
     
@@ -171,9 +178,13 @@ if not centers_sel or not skus_sel:
 # 최신 스냅샷 날짜
 latest_dt = snap_long["date"].max()
 
+# 최신 날짜 슬라이스를 한 번만 계산해 KPI 렌더러 셋이 공유
+latest_snap = snap_long[snap_long["date"] == latest_dt]
+
 # KPI 섹션
 st.header("📊 주요 지표")
-render_kpis(snap_long, moves, centers_sel, skus_sel, latest_dt, today_norm, lag_days)
+render_kpis(snap_long, moves, centers_sel, skus_sel, latest_dt, today_norm, lag_days,
+            latest_snap=latest_snap)
 
 st.divider()
 
@@ -195,17 +206,24 @@ if use_cons_forecast and not timeline.empty:
     )
 
 # 오늘 앵커: 차트의 '오늘' 값을 스냅샷 값으로 고정
-anchor_base = (snap_long[
-    (snap_long["date"] == latest_dt) &
-    (snap_long["center"].isin(centers_sel)) &
-    (snap_long["resource_code"].isin(skus_sel))
-].groupby(["center","resource_code"])["stock_qty"].sum())
-
-for (ct, sku), y in anchor_base.items():
-    m = ((timeline["center"] == ct) &
-         (timeline["resource_code"] == sku) &
-         (timeline["date"] == today_norm))
-    timeline.loc[m, "stock_qty"] = int(y)
+anchor_base = (latest_snap[
+    (latest_snap["center"].isin(centers_sel)) &
+    (latest_snap["resource_code"].isin(skus_sel))
+].groupby(["center","resource_code"], observed=True)["stock_qty"].sum())
+
+# 머지/마스크 없이 (center, sku, date) 인덱스 정렬 기반 update로 오늘 값을 덮어씀
+if not anchor_base.empty and not timeline.empty:
+    anchor_series = anchor_base.astype(int)
+    anchor_series.index = pd.MultiIndex.from_arrays(
+        [anchor_series.index.get_level_values(0).astype(str),
+         anchor_series.index.get_level_values(1).astype(str),
+         [today_norm] * len(anchor_series)],
+        names=["center", "resource_code", "date"])
+    tl = timeline.set_index(["center", "resource_code", "date"], drop=False)
+    _stock = tl["stock_qty"].copy()
+    _stock.update(anchor_series)
+    tl["stock_qty"] = _stock
+    timeline = tl.reset_index(drop=True)
 
 # 차트 렌더링
 if timeline.empty:
@@ -229,8 +247,10 @@ with tab3:
 
 # 센터별 KPI
 st.header("🏢 센터별 현황")
-render_center_kpis(snap_long, moves, centers_sel, skus_sel, latest_dt, today_norm)
+render_center_kpis(snap_long, moves, centers_sel, skus_sel, latest_dt, today_norm,
+                   latest_snap=latest_snap)
 
 # SKU별 KPI
 st.header("📦 SKU별 현황")
-render_sku_kpis(snap_long, moves, centers_sel, skus_sel, latest_dt, today_norm)
+render_sku_kpis(snap_long, moves, centers_sel, skus_sel, latest_dt, today_norm,
+                latest_snap=latest_snap)
@@ -1 +1,9 @@
 # SCM Dashboard Package
+import pandas as pd
+
+# Copy-on-Write 활성화 — 파생 프레임 수정 시 전체 BlockManager 복사 대신
+# 수정된 컬럼만 복사된다 (미지원 구버전 pandas에서는 조용히 건너뜀)
+try:
+    pd.set_option("mode.copy_on_write", True)
+except (KeyError, AttributeError):
+    pass
@@ -0,0 +1,113 @@
+"""numba JIT 커널 모음 (내부용).
+
+numba는 선택 의존성이다: 설치돼 있으면 그룹 단위 연산을 LLVM으로 컴파일해
+pandas groupby 디스패치 비용 없이 prange로 병렬 실행하고, 없으면 호출부가
+HAVE_NUMBA를 보고 기존 벡터화 경로를 그대로 사용한다.
+
+커널은 (정렬된 값 배열, 그룹 경계 offsets) 형태를 받는다. offsets는 길이
+n_groups+1 배열로, 그룹 g의 행 구간은 [offsets[g], offsets[g+1])이다.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange, types as _nbt
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):  # 데코레이터 폴백 — 함수를 그대로 반환
+        if args and callable(args[0]):
+            return args[0]
+
+        def deco(func):
+            return func
+        return deco
+
+    prange = range
+
+
+@njit(parallel=True, cache=True)
+def slope_per_group(x, y, offsets, out):
+    """그룹 세그먼트별 닫힌꼴 OLS 기울기 (음수는 0으로 클램프).
+
+    유효하지 않은 그룹(n < 2 또는 분모 0)은 NaN을 기록한다.
+    """
+    for g in prange(len(offsets) - 1):
+        s, e = offsets[g], offsets[g + 1]
+        n = float(e - s)
+        sx = 0.0
+        sy = 0.0
+        sxy = 0.0
+        sx2 = 0.0
+        for i in range(s, e):
+            xv = x[i]
+            yv = y[i]
+            sx += xv
+            sy += yv
+            sxy += xv * yv
+            sx2 += xv * xv
+        denom = n * sx2 - sx * sx
+        if e - s >= 2 and denom != 0.0:
+            slope = (n * sxy - sx * sy) / denom
+            out[g] = slope if slope > 0.0 else 0.0
+        else:
+            out[g] = np.nan
+
+
+if HAVE_NUMBA:
+    # CoW(pandas 3 기본) 환경에서 Series.to_numpy()는 읽기 전용 뷰를 반환한다.
+    # 명시적 시그니처 디스패처는 새 특수화를 컴파일하지 않으므로, 배열 인자를
+    # readonly로 선언해야 읽기 전용 입력이 그대로 디스패치된다 (쓰기 가능
+    # 배열 → readonly 변환은 numba가 허용).
+    _ro_i8 = _nbt.Array(_nbt.int64, 1, "C", readonly=True)
+    _ro_f8 = _nbt.Array(_nbt.float64, 1, "C", readonly=True)
+    _ro_b1 = _nbt.Array(_nbt.boolean, 1, "C", readonly=True)
+    _IN_TRANSIT_SIG = _nbt.float64(
+        _ro_i8, _ro_i8, _ro_f8, _ro_b1, _nbt.int64, _nbt.int64, _nbt.int64
+    )
+else:
+    _IN_TRANSIT_SIG = None
+
+
+@njit(_IN_TRANSIT_SIG, parallel=True, cache=True)
+def in_transit_total(inbound, arrival, qty, include, today, lag, day):
+    """이동중 수량 합계 — 행별 예측 종료일 계산과 합산을 한 패스로 수행.
+
+    inbound/arrival은 int64(ns) 뷰이며 NaT는 int64 최솟값으로 들어온다.
+    종료일 규칙: inbound → arrival(미래) → arrival+lag(과거) → today+1일.
+    include가 참이고 today < 종료일인 행의 qty를 누적한다.
+
+    명시적 시그니처로 임포트 시점에 미리 컴파일해(cache=True로 디스크 캐시)
+    Streamlit rerun마다 첫 호출 JIT 지연이 생기지 않도록 한다.
+    """
+    NAT = -9223372036854775808
+    total = 0.0
+    for i in prange(len(qty)):
+        if include[i]:
+            if inbound[i] != NAT:
+                end = inbound[i]
+            elif arrival[i] != NAT:
+                end = arrival[i] if arrival[i] > today else arrival[i] + lag
+            else:
+                end = today + day
+            if today < end:
+                total += qty[i]
+    return total
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def consume_per_group(stock, rate, uplift, apply_mask, offsets, out):
+    """그룹별 소진 적용을 한 패스로 융합한 커널.
+
+    행별 감소분 계산(rate[g] × uplift[i]) → 누적 → 0 클램프를 중간 배열
+    없이 수행한다: out[i] = max(0, stock[i] - 누적 감소).
+    apply_mask가 False인 행(소진 시작일 이전, In-Transit)은 감소분 0.
+    """
+    for g in prange(len(offsets) - 1):
+        s, e = offsets[g], offsets[g + 1]
+        cum = 0.0
+        for i in range(s, e):
+            if apply_mask[i]:
+                cum += rate[g] * uplift[i]
+            v = stock[i] - cum
+            out[i] = v if v > 0.0 else 0.0
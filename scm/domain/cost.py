@@ -26,23 +26,22 @@ def pivot_inventory_cost_from_raw(
     if cost_per_unit is None:
         cost_per_unit = 1.0
     
-    # 최신 스냅샷 데이터 필터링
+    # 최신 스냅샷 데이터 필터링 (읽기 전용이므로 복사 불필요)
     latest_snap = snap_long[
         (snap_long["date"] == latest_dt) &
         (snap_long["center"].isin(centers_sel)) &
         (snap_long["resource_code"].isin(skus_sel))
-    ].copy()
-    
+    ]
+
     if latest_snap.empty:
         return pd.DataFrame(columns=["center", "resource_code", "stock_qty", "cost"])
-    
-    # 비용 계산
-    latest_snap["cost"] = latest_snap["stock_qty"] * cost_per_unit
-    
-    # 피벗 테이블 생성
-    pivot_df = latest_snap.groupby(["center", "resource_code"]).agg({
-        "stock_qty": "sum",
-        "cost": "sum"
-    }).reset_index()
-    
+
+    # cost는 stock_qty의 선형 함수이므로 먼저 집계하고 마지막에 한 번만 곱한다
+    pivot_df = (
+        latest_snap.groupby(["center", "resource_code"], sort=False, observed=True)["stock_qty"]
+        .sum()
+        .reset_index()
+    )
+    pivot_df["cost"] = pivot_df["stock_qty"] * cost_per_unit
+
     return pivot_df
@@ -2,6 +2,9 @@ import pandas as pd
 import numpy as np
 from typing import List, Optional, Dict, Any
 
+from scm._kernels import HAVE_NUMBA, slope_per_group, consume_per_group
+from scm.transform.normalize import _to_datetime_fast
+
 def estimate_daily_consumption(
     snap_long: pd.DataFrame,
     moves: pd.DataFrame,
@@ -22,74 +25,75 @@ def estimate_daily_consumption(
     Returns:
         일일 소진량 DataFrame
     """
-    results = []
-    
-    for sku in skus_sel:
-        for ct in centers_sel:
-            # 센터별 스냅샷 데이터
-            snap_ct = snap_long[
-                (snap_long["resource_code"] == sku) & 
-                (snap_long["center"] == ct)
-            ].sort_values("date")
-            
-            if len(snap_ct) < 2:
-                continue
-            
-            # 출고 데이터
-            outbound = moves[
-                (moves["resource_code"] == sku) & 
-                (moves["from_center"].astype(str) == str(ct)) &
-                (moves["onboard_date"].notna())
-            ].copy()
-            
-            if outbound.empty:
-                continue
-            
-            # 일별 출고량 집계
-            daily_outbound = (
-                outbound.groupby("onboard_date")["qty_ea"]
-                .sum()
-                .reset_index()
-                .rename(columns={"onboard_date": "date"})
-            )
-            
-            # 스냅샷과 출고 데이터 병합
-            merged = pd.merge(
-                snap_ct[["date", "stock_qty"]], 
-                daily_outbound, 
-                on="date", 
-                how="left"
-            ).fillna(0)
-            
-            # 회귀 분석을 통한 일일 소진량 추정
-            if len(merged) >= 2:
-                # 최근 lookback_days일 데이터만 사용
-                recent_data = merged.tail(lookback_days)
-                
-                if len(recent_data) >= 2:
-                    # 선형 회귀: stock_qty = a - b * days
-                    days = np.arange(len(recent_data))
-                    stock_qty = recent_data["stock_qty"].values
-                    
-                    # 회귀 계수 계산
-                    n = len(days)
-                    sum_x = np.sum(days)
-                    sum_y = np.sum(stock_qty)
-                    sum_xy = np.sum(days * stock_qty)
-                    sum_x2 = np.sum(days * days)
-                    
-                    # 기울기 (일일 소진량)
-                    if n * sum_x2 - sum_x * sum_x != 0:
-                        daily_consumption = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
-                        daily_consumption = max(0, daily_consumption)  # 음수 방지
-                        
-                        results.append({
-                            "resource_code": sku,
-                            "center": ct,
-                            "daily_consumption": daily_consumption
-                        })
-    
-    return pd.DataFrame(results)
+    empty = pd.DataFrame(columns=["resource_code", "center", "daily_consumption"])
+
+    # (sku, center) 쌍별 파이썬 루프 대신 전체를 한 번에 필터 → groupby로 처리
+    snap = snap_long[
+        snap_long["resource_code"].isin(skus_sel) &
+        snap_long["center"].isin(centers_sel)
+    ]
+    if snap.empty or moves is None or moves.empty:
+        return empty
+
+    # 출고 이력(onboard 기록)이 있는 (sku, center) 쌍만 추정 대상 (기존 게이트 유지)
+    out_pairs = moves.loc[
+        moves["resource_code"].isin(skus_sel) &
+        moves["from_center"].astype(str).isin([str(c) for c in centers_sel]) &
+        moves["onboard_date"].notna(),
+        ["resource_code", "from_center"]
+    ].astype(str).drop_duplicates()
+    if out_pairs.empty:
+        return empty
+    valid_pairs = pd.MultiIndex.from_frame(
+        out_pairs.rename(columns={"from_center": "center"})
+    )
+
+    # 쌍별 최근 lookback_days개 스냅샷에 대해 닫힌꼴 OLS 기울기 계산
+    snap = snap.sort_values(["resource_code", "center", "date"])
+    recent = snap.groupby(["resource_code", "center"], sort=False, observed=True).tail(lookback_days)
+
+    x = recent.groupby(["resource_code", "center"], sort=False, observed=True).cumcount().astype(float).to_numpy()
+    y = recent["stock_qty"].astype(float).to_numpy()
+
+    if HAVE_NUMBA:
+        # 정렬된 배열 + 그룹 경계(offsets)로 JIT 커널에서 그룹별 기울기를 병렬 계산
+        sizes = recent.groupby(["resource_code", "center"], sort=False, observed=True).size()
+        offsets = np.concatenate(([0], np.cumsum(sizes.to_numpy())))
+        slopes = np.empty(len(sizes), dtype=np.float64)
+        slope_per_group(x, y, offsets, slopes)
+        stats = pd.DataFrame({"daily_consumption": slopes},
+                             index=pd.MultiIndex.from_arrays(
+                                 [sizes.index.get_level_values(0).astype(str),
+                                  sizes.index.get_level_values(1).astype(str)],
+                                 names=["resource_code", "center"]))
+        stats = stats[stats["daily_consumption"].notna() & stats.index.isin(valid_pairs)]
+        if stats.empty:
+            return empty
+        return stats.reset_index()[["resource_code", "center", "daily_consumption"]]
+
+    stats = (
+        pd.DataFrame({
+            "resource_code": recent["resource_code"].astype(str).to_numpy(),
+            "center": recent["center"].astype(str).to_numpy(),
+            "x": x, "y": y, "xy": x * y, "x2": x * x,
+        })
+        .groupby(["resource_code", "center"], sort=False)
+        .agg(n=("x", "size"), sum_x=("x", "sum"), sum_y=("y", "sum"),
+             sum_xy=("xy", "sum"), sum_x2=("x2", "sum"))
+    )
+
+    stats = stats[(stats["n"] >= 2) & stats.index.isin(valid_pairs)]
+    denom = stats["n"] * stats["sum_x2"] - stats["sum_x"] ** 2
+    stats = stats[denom != 0]
+    if stats.empty:
+        return empty
+
+    # 기울기 (일일 소진량), 음수 방지
+    slope = (stats["n"] * stats["sum_xy"] - stats["sum_x"] * stats["sum_y"]) / (
+        stats["n"] * stats["sum_x2"] - stats["sum_x"] ** 2
+    )
+    result = slope.clip(lower=0).rename("daily_consumption").reset_index()
+    return result[["resource_code", "center", "daily_consumption"]]
 
 def apply_consumption_with_events(
     timeline: pd.DataFrame,
@@ -120,7 +124,8 @@ def apply_consumption_with_events(
     if timeline.empty:
         return timeline
     
-    out = timeline.copy()
+    # timeline은 읽기만 하고 sort_values가 새 객체를 만들므로 복사 불필요
+    out = timeline
     
     # 일일 소진량 추정
     consumption = estimate_daily_consumption(
@@ -137,7 +142,7 @@ def apply_consumption_with_events(
     if date_col is None:
         raise KeyError("snap_long에는 'date' 또는 'snapshot_date' 컬럼이 필요합니다.")
     
-    latest_snap = pd.to_datetime(snap_long[date_col]).max().normalize()
+    latest_snap = _to_datetime_fast(snap_long[date_col]).max().normalize()
     today_norm = pd.Timestamp.today().normalize()
     cons_start = max(
         latest_snap + pd.Timedelta(days=1),
@@ -148,57 +153,58 @@ def apply_consumption_with_events(
     if cons_start > end_dt:
         return out
     
-    # 이벤트 처리
-    idx = pd.date_range(cons_start, end_dt, freq="D")
-    uplift = pd.Series(1.0, index=idx)
+    # 이벤트 처리 — 기간 전체 길이의 밀집 Series 대신 (날짜, 배수) 희소 배열
+    ev_dates = np.array([], dtype="datetime64[D]")
+    ev_vals = np.array([], dtype=np.float64)
     if events:
-        for e in events:
-            if "date" in e and "uplift" in e:
-                event_date = pd.to_datetime(e["date"]).normalize()
-                if event_date in idx:
-                    uplift.loc[event_date] = float(e["uplift"])
-    
-    # 센터별, SKU별로 소진 적용
-    chunks = []
-    for (ct, sku), g in out.groupby(["center", "resource_code"]):
-        if ct == "In-Transit":
-            chunks.append(g)
-            continue
-        
-        # 해당 센터/SKU의 일일 소진량
-        cons_data = consumption[
-            (consumption["center"] == ct) & 
-            (consumption["resource_code"] == sku)
-        ]
-        
-        if cons_data.empty:
-            chunks.append(g)
-            continue
-        
-        rate = cons_data["daily_consumption"].iloc[0]
-        if rate <= 0:
-            chunks.append(g)
-            continue
-        
-        # 소진 적용
-        mask = g["date"] >= cons_start
-        if not mask.any():
-            chunks.append(g)
-            continue
-        
-        daily = g.loc[mask, "date"].map(uplift).fillna(1.0).values * rate
-        stk = g.loc[mask, "stock_qty"].astype(float).values
-        for i in range(len(stk)):
-            dec = daily[i]
-            stk[i:] = np.maximum(0.0, stk[i:] - dec)
-        # float 값을 int로 변환하여 할당
-        g.loc[mask, "stock_qty"] = stk.astype(int)
-        chunks.append(g)
-    
-    if not chunks:
-        return out
-    
-    result = pd.concat(chunks, ignore_index=True)
+        pairs = sorted(
+            (pd.to_datetime(e["date"]).normalize().to_datetime64(), float(e["uplift"]))
+            for e in events if "date" in e and "uplift" in e
+        )
+        if pairs:
+            ev_dates = np.array([d for d, _ in pairs]).astype("datetime64[D]")
+            ev_vals = np.array([v for _, v in pairs], dtype=np.float64)
+    
+    # 센터별, SKU별 파이썬 루프 대신 인덱스 정렬 + 그룹 누적합으로 전체를 한 번에 적용
+    # (mergesort는 안정 정렬이라 그룹 내 기존 날짜 순서를 그대로 보존)
+    result = out.sort_values(["center", "resource_code"], kind="mergesort", ignore_index=True)
+
+    # (center, sku)별 일일 소진율을 열로 정렬 결합
+    rate_map = consumption.set_index(["center", "resource_code"])["daily_consumption"]
+    keys = pd.MultiIndex.from_arrays([
+        result["center"].astype(str), result["resource_code"].astype(str)
+    ])
+    rate = rate_map.reindex(keys).fillna(0.0).to_numpy()
+
+    # In-Transit 및 소진 시작일 이전 행은 감소분 0 → 누적합에도 영향 없음
+    apply_mask = ((result["date"] >= cons_start) &
+                  (result["center"] != "In-Transit")).to_numpy()
+
+    # searchsorted로 이벤트 날짜에 해당하는 행만 배수 적용 (해시/조회 Series 불필요)
+    uplift_arr = np.ones(len(result), dtype=np.float64)
+    if len(ev_dates):
+        row_days = result["date"].to_numpy().astype("datetime64[D]")
+        pos = np.searchsorted(ev_dates, row_days).clip(max=len(ev_dates) - 1)
+        hit = ev_dates[pos] == row_days
+        uplift_arr[hit] = ev_vals[pos[hit]]
+
+    stock = pd.to_numeric(result["stock_qty"], errors="coerce").fillna(0).astype(float).to_numpy()
+
+    if HAVE_NUMBA:
+        # 감소분 계산·누적·클램프를 JIT 커널 한 번에 융합 (중간 배열 없음).
+        # 그룹별 소진율은 정렬된 프레임의 그룹 첫 행 위치에서 뽑는다.
+        sizes = result.groupby(["center", "resource_code"], sort=False, observed=True).size().to_numpy()
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        consumed = np.empty(len(result), dtype=np.float64)
+        consume_per_group(stock, rate[offsets[:-1]], uplift_arr, apply_mask, offsets, consumed)
+        result["stock_qty"] = consumed
+    else:
+        dec = np.where(apply_mask, uplift_arr * rate, 0.0)
+        cum = (pd.Series(dec)
+               .groupby([result["center"].to_numpy(), result["resource_code"].to_numpy()])
+               .cumsum()
+               .to_numpy())
+        result["stock_qty"] = np.clip(stock - cum, 0.0, None)
     result["stock_qty"] = pd.to_numeric(result["stock_qty"], errors="coerce").fillna(0).replace([np.inf, -np.inf], 0).round().clip(lower=0).astype(int)
-    
+
     return result
@@ -15,7 +15,10 @@ def build_timeline(
 ) -> pd.DataFrame:
     """
     재고 타임라인을 구축합니다.
-    
+
+    (sku, center) 이중 루프 대신 증감(delta)을 긴 형태로 모아
+    날짜×(center, sku) 행렬로 피벗한 뒤 누적합 한 번으로 전체 재고를 계산합니다.
+
     Args:
         snap_long: 정규화된 스냅샷 데이터
         moves: 이동 데이터
@@ -26,136 +29,134 @@ def build_timeline(
         horizon_days: 미래 전망 일수
         today: 오늘 날짜
         lag_days: 도착-입고 지연 일수
-    
+
     Returns:
         타임라인 DataFrame
     """
     if today is None:
         today = pd.Timestamp.today().normalize()
-    
+
     horizon_end = end_dt + pd.Timedelta(days=horizon_days)
-    lines = []
-    
-    for sku in skus_sel:
-        # 스냅샷 데이터 필터링
-        snap_sku = snap_long[
-            (snap_long["resource_code"] == sku) & 
-            (snap_long["center"].isin(centers_sel))
-        ].copy()
-        
-        if snap_sku.empty:
-            continue
-            
-        # 이동 데이터 필터링
-        mv = moves[moves["resource_code"] == sku].copy()
-        
-        # 예측 입고일 계산
-        mv["pred_inbound_date"] = mv["inbound_date"]
-        mask = mv["pred_inbound_date"].isna() & mv["arrival_date"].notna()
-        fut = mask & (mv["arrival_date"] > today)
-        past = mask & (mv["arrival_date"] <= today)
-        
-        mv.loc[fut, "pred_inbound_date"] = mv.loc[fut, "arrival_date"]
-        mv.loc[past, "pred_inbound_date"] = mv.loc[past, "arrival_date"] + pd.Timedelta(days=lag_days)
-        
-        # In-Transit 종료일 계산
-        mv["pred_end_date"] = mv["pred_inbound_date"]
-        mv.loc[mv["pred_end_date"].isna(), "pred_end_date"] = today + pd.Timedelta(days=1)
-        
-        for ct in centers_sel:
-            # 센터별 스냅샷
-            snap_ct = snap_sku[snap_sku["center"] == ct]
-            if snap_ct.empty:
-                continue
-                
-            # 최신 스냅샷 날짜
-            latest_dt = snap_ct["date"].max()
-            base_stock = snap_ct[snap_ct["date"] == latest_dt]["stock_qty"].sum()
-            
-            # 타임라인 생성
-            idx = pd.date_range(start_dt, horizon_end, freq="D")
-            
-            # 출고 이벤트
-            eff_minus = (
-                mv[(mv["from_center"].astype(str) == str(ct)) & 
-                   (mv["onboard_date"].notna()) & 
-                   (mv["onboard_date"] > latest_dt)]
-                .groupby("onboard_date", as_index=False)["qty_ea"].sum()
-                .rename(columns={"onboard_date": "date", "qty_ea": "delta"})
-            )
-            eff_minus["delta"] *= -1
-            
-            # 입고 이벤트 (예측 입고일 사용)
-            eff_plus = (
-                mv[(mv["to_center"].astype(str) == str(ct)) & 
-                   (mv["pred_inbound_date"].notna()) & 
-                   (mv["pred_inbound_date"] > latest_dt)]
-                .groupby("pred_inbound_date", as_index=False)["qty_ea"].sum()
-                .rename(columns={"pred_inbound_date": "date", "qty_ea": "delta"})
-            )
-            
-            # 이벤트 합치기
-            events = pd.concat([eff_minus, eff_plus], ignore_index=True)
-            if not events.empty:
-                events = events.groupby("date")["delta"].sum().reset_index()
-                events = events.set_index("date").reindex(idx, fill_value=0)["delta"]
-            else:
-                events = pd.Series(0, index=idx)
-            
-            # 재고 계산
-            stock_series = pd.Series(base_stock, index=idx)
-            for i, (date, delta) in enumerate(events.items()):
-                if i == 0:
-                    stock_series.iloc[i:] += delta
-                else:
-                    stock_series.iloc[i:] += delta
-            
-            stock_series = stock_series.clip(lower=0).astype(int)
-            
-            # 결과 추가
-            lines.append(pd.DataFrame({
-                "date": stock_series.index,
-                "center": ct,
-                "resource_code": sku,
-                "stock_qty": stock_series.values
-            }))
-            
-            # In-Transit 라인 (Non-WIP)
-            g_nonwip = mv[
-                (mv["carrier_mode"] != "WIP") & 
-                (mv["to_center"].astype(str) == str(ct))
-            ].copy()
-            
-            if not g_nonwip.empty:
-                # 시작: onboard_date
-                starts = (
-                    g_nonwip.dropna(subset=["onboard_date"])
-                    .groupby("onboard_date")["qty_ea"].sum()
-                )
-                
-                # 종료: pred_end_date
-                ends = (
-                    g_nonwip.groupby("pred_end_date")["qty_ea"].sum() * -1
-                )
-                
-                # 델타 계산
-                delta = (
-                    starts.rename_axis("date").to_frame("delta")
-                    .add(ends.rename_axis("date").to_frame("delta"), fill_value=0)["delta"]
-                    .sort_index()
-                )
-                
-                s = delta.reindex(idx, fill_value=0).cumsum().clip(lower=0)
-                
-                if s.any():
-                    lines.append(pd.DataFrame({
-                        "date": s.index,
-                        "center": "In-Transit",
-                        "resource_code": sku,
-                        "stock_qty": s.values
-                    }))
-    
-    if not lines:
-        return pd.DataFrame(columns=["date", "center", "resource_code", "stock_qty"])
-    
-    return pd.concat(lines, ignore_index=True)
+    idx = pd.date_range(start_dt, horizon_end, freq="D")
+    empty = pd.DataFrame(columns=["date", "center", "resource_code", "stock_qty"])
+
+    # 1) 스냅샷을 한 번만 필터하고 (center, sku)별 최신 날짜/기초 재고 계산
+    snap = snap_long[
+        snap_long["resource_code"].isin(skus_sel) &
+        snap_long["center"].isin(centers_sel)
+    ]
+    if snap.empty:
+        return empty
+
+    latest = (snap.groupby(["center", "resource_code"], sort=False, observed=True)["date"]
+              .max().rename("latest_dt").reset_index())
+    latest["center"] = latest["center"].astype(str)
+    latest["resource_code"] = latest["resource_code"].astype(str)
+
+    # CoW 하에서는 얕은 복사로 충분 — 아래 컬럼 대입 시 해당 컬럼만 복사된다
+    snap_keyed = snap.copy(deep=False)
+    snap_keyed["center"] = snap_keyed["center"].astype(str)
+    snap_keyed["resource_code"] = snap_keyed["resource_code"].astype(str)
+    base_df = (snap_keyed.merge(latest, on=["center", "resource_code"]))
+    base_df = (base_df[base_df["date"] == base_df["latest_dt"]]
+               .groupby(["center", "resource_code"], sort=False)["stock_qty"]
+               .sum().reset_index())
+    pairs = pd.MultiIndex.from_frame(base_df[["center", "resource_code"]])
+    base_series = pd.Series(base_df["stock_qty"].to_numpy(dtype=float), index=pairs)
+
+    # 2) 이동 데이터도 한 번만 필터하고 예측 입고/종료일을 전체에 대해 벡터화 계산
+    mv = moves[moves["resource_code"].isin(skus_sel)]
+    mv["_from"] = mv["from_center"].astype(str)
+    mv["_to"] = mv["to_center"].astype(str)
+    mv["resource_code"] = mv["resource_code"].astype(str)
+
+    mv["pred_inbound_date"] = mv["inbound_date"]
+    mask = mv["pred_inbound_date"].isna() & mv["arrival_date"].notna()
+    fut = mask & (mv["arrival_date"] > today)
+    past = mask & (mv["arrival_date"] <= today)
+    mv.loc[fut, "pred_inbound_date"] = mv.loc[fut, "arrival_date"]
+    mv.loc[past, "pred_inbound_date"] = mv.loc[past, "arrival_date"] + pd.Timedelta(days=lag_days)
+
+    mv["pred_end_date"] = mv["pred_inbound_date"]
+    mv.loc[mv["pred_end_date"].isna(), "pred_end_date"] = today + pd.Timedelta(days=1)
+
+    # 3) 센터 라인 증감: 출고(-)는 onboard, 입고(+)는 예측 입고일 기준 (쌍별 최신 스냅샷 이후만)
+    delta_frames = []
+
+    minus = mv[mv["onboard_date"].notna()].merge(
+        latest, left_on=["_from", "resource_code"], right_on=["center", "resource_code"])
+    minus = minus[minus["onboard_date"] > minus["latest_dt"]]
+    if not minus.empty:
+        delta_frames.append(pd.DataFrame({
+            "date": minus["onboard_date"].to_numpy(),
+            "center": minus["center"].to_numpy(),
+            "resource_code": minus["resource_code"].to_numpy(),
+            "delta": -minus["qty_ea"].to_numpy(dtype=float),
+        }))
+
+    plus = mv[mv["pred_inbound_date"].notna()].merge(
+        latest, left_on=["_to", "resource_code"], right_on=["center", "resource_code"])
+    plus = plus[plus["pred_inbound_date"] > plus["latest_dt"]]
+    if not plus.empty:
+        delta_frames.append(pd.DataFrame({
+            "date": plus["pred_inbound_date"].to_numpy(),
+            "center": plus["center"].to_numpy(),
+            "resource_code": plus["resource_code"].to_numpy(),
+            "delta": plus["qty_ea"].to_numpy(dtype=float),
+        }))
+
+    if delta_frames:
+        deltas = pd.concat(delta_frames, ignore_index=True)
+        delta_mat = (deltas.pivot_table(index="date", columns=["center", "resource_code"],
+                                        values="delta", aggfunc="sum", fill_value=0)
+                     .reindex(idx, fill_value=0)
+                     .reindex(columns=pairs, fill_value=0))
+    else:
+        delta_mat = pd.DataFrame(0.0, index=idx, columns=pairs)
+
+    # 기초 재고 + 누적 증감 → 전 구간 재고 (한 번의 cumsum)
+    stock_mat = delta_mat.cumsum(axis=0).add(base_series, axis=1).clip(lower=0).astype(int)
+    stock_mat = stock_mat.rename_axis(index="date", columns=["center", "resource_code"])
+    result = (stock_mat.stack(["center", "resource_code"])
+              .rename("stock_qty").reset_index())
+
+    # 4) In-Transit 라인: (도착 센터, sku) 쌍별 onboard(+)/예측 종료(-) 누적
+    trans = mv[mv["carrier_mode"] != "WIP"].merge(
+        base_df[["center", "resource_code"]],
+        left_on=["_to", "resource_code"], right_on=["center", "resource_code"])
+    t_frames = []
+    t_starts = trans[trans["onboard_date"].notna()]
+    if not t_starts.empty:
+        t_frames.append(pd.DataFrame({
+            "date": t_starts["onboard_date"].to_numpy(),
+            "center": t_starts["center"].to_numpy(),
+            "resource_code": t_starts["resource_code"].to_numpy(),
+            "delta": t_starts["qty_ea"].to_numpy(dtype=float),
+        }))
+    if not trans.empty:
+        t_frames.append(pd.DataFrame({
+            "date": trans["pred_end_date"].to_numpy(),
+            "center": trans["center"].to_numpy(),
+            "resource_code": trans["resource_code"].to_numpy(),
+            "delta": -trans["qty_ea"].to_numpy(dtype=float),
+        }))
+
+    if t_frames:
+        t_deltas = pd.concat(t_frames, ignore_index=True)
+        t_mat = (t_deltas.pivot_table(index="date", columns=["center", "resource_code"],
+                                      values="delta", aggfunc="sum", fill_value=0)
+                 .reindex(idx, fill_value=0)
+                 .cumsum(axis=0).clip(lower=0))
+        t_mat = t_mat.loc[:, (t_mat != 0).any(axis=0)]
+        if not t_mat.empty:
+            t_long = (t_mat.rename_axis(index="date", columns=["center", "resource_code"])
+                      .stack(["center", "resource_code"])
+                      .rename("stock_qty").reset_index())
+            # 원래 구현처럼 도착 센터별 시리즈를 각각 'In-Transit' 라인으로 표기
+            t_long["center"] = "In-Transit"
+            result = pd.concat([result, t_long], ignore_index=True)
+
+    if result.empty:
+        return empty
+
+    return result[["date", "center", "resource_code", "stock_qty"]]
@@ -1,110 +1,241 @@
+import io
 import pandas as pd
 import streamlit as st
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 class ExcelLoadError(Exception):
     """Excel 파일 로딩 에러"""
     pass
 
-def load_from_excel(uploaded_file) -> Dict[str, pd.DataFrame]:
+def _rewind(uploaded_file) -> None:
+    """업로드 파일 객체를 처음 위치로 되돌립니다 (여러 번 읽기 대비)."""
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+
+def _excel_engine() -> str:
+    """python-calamine(Rust 파서)이 설치돼 있으면 사용하고, 없으면 openpyxl 폴백.
+
+    calamine은 순수 파이썬인 openpyxl 대비 대용량 xlsx에서 수 배 빠르다.
     """
-    Excel 파일에서 데이터를 로드합니다.
-    
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return "openpyxl"
+
+@st.cache_data(show_spinner=False)
+def _list_sheets_bytes(data: bytes) -> List[str]:
+    """파일 바이트를 키로 시트 이름 목록을 캐시합니다 (rerun 간 재파싱 방지)."""
+    import openpyxl
+    wb = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+@st.cache_data(show_spinner=False)
+def _read_sheet_bytes(data: bytes, sheet_name: str) -> pd.DataFrame:
+    """(파일 바이트, 시트 이름)을 키로 파싱 결과를 캐시합니다."""
+    df = pd.read_excel(io.BytesIO(data), sheet_name=sheet_name, engine=_excel_engine())
+    df.columns = df.columns.astype(str)
+    return df.dropna(how='all')
+
+def list_sheets(uploaded_file) -> List[str]:
+    """
+    Excel 파일의 시트 이름 목록만 읽습니다.
+
+    read_only 모드로 워크북 메타데이터만 열기 때문에 전체 셀을
+    파싱하지 않습니다.
+
     Args:
         uploaded_file: Streamlit 업로드된 파일 객체
-    
+
     Returns:
-        시트별 DataFrame 딕셔너리
-    
+        시트 이름 리스트
+
     Raises:
         ExcelLoadError: 파일 로딩 실패 시
     """
     try:
         if uploaded_file is None:
             raise ExcelLoadError("업로드된 파일이 없습니다.")
-        
-        # Excel 파일 읽기
-        excel_data = pd.read_excel(uploaded_file, sheet_name=None, engine='openpyxl')
-        
-        if not excel_data:
+
+        if hasattr(uploaded_file, "getvalue"):
+            # Streamlit 업로드 객체: 바이트 기준으로 캐시된 경로 사용
+            names = _list_sheets_bytes(uploaded_file.getvalue())
+        else:
+            import openpyxl
+            _rewind(uploaded_file)
+            wb = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+            try:
+                names = list(wb.sheetnames)
+            finally:
+                wb.close()
+            _rewind(uploaded_file)
+
+        if not names:
             raise ExcelLoadError("Excel 파일에 시트가 없습니다.")
-        
-        # 데이터 정리
+        return names
+
+    except ExcelLoadError:
+        raise
+    except Exception as e:
+        raise ExcelLoadError(f"Excel 파일 로딩 중 오류가 발생했습니다: {str(e)}")
+
+def read_sheet(uploaded_file, sheet_name: str) -> pd.DataFrame:
+    """
+    Excel 파일에서 지정한 시트 하나만 읽어 정리합니다.
+
+    Args:
+        uploaded_file: Streamlit 업로드된 파일 객체
+        sheet_name: 읽을 시트 이름
+
+    Returns:
+        정리된 DataFrame
+
+    Raises:
+        ExcelLoadError: 파일 로딩 실패 시
+    """
+    try:
+        if hasattr(uploaded_file, "getvalue"):
+            # Streamlit 업로드 객체: 바이트 기준으로 캐시된 경로 사용
+            return _read_sheet_bytes(uploaded_file.getvalue(), sheet_name)
+
+        _rewind(uploaded_file)
+        df = pd.read_excel(uploaded_file, sheet_name=sheet_name, engine=_excel_engine())
+        _rewind(uploaded_file)
+
+        # 컬럼명 정리
+        df.columns = df.columns.astype(str)
+        df = df.dropna(how='all')  # 빈 행 제거
+        return df
+
+    except Exception as e:
+        raise ExcelLoadError(f"Excel 파일 로딩 중 오류가 발생했습니다: {str(e)}")
+
+def load_from_excel(uploaded_file) -> Dict[str, pd.DataFrame]:
+    """
+    Excel 파일에서 데이터를 로드합니다.
+
+    Args:
+        uploaded_file: Streamlit 업로드된 파일 객체
+
+    Returns:
+        시트별 DataFrame 딕셔너리
+
+    Raises:
+        ExcelLoadError: 파일 로딩 실패 시
+    """
+    try:
         cleaned_data = {}
-        for sheet_name, df in excel_data.items():
-            if df.empty:
-                continue
-            
-            # 컬럼명 정리
-            df.columns = df.columns.astype(str)
-            df = df.dropna(how='all')  # 빈 행 제거
-            
+        for sheet_name in list_sheets(uploaded_file):
+            df = read_sheet(uploaded_file, sheet_name)
             if not df.empty:
                 cleaned_data[sheet_name] = df
-        
+
         if not cleaned_data:
             raise ExcelLoadError("유효한 데이터가 없습니다.")
-        
+
         return cleaned_data
-        
+
+    except ExcelLoadError:
+        raise
     except Exception as e:
         raise ExcelLoadError(f"Excel 파일 로딩 중 오류가 발생했습니다: {str(e)}")
 
+def load_from_parquet(uploaded_file) -> pd.DataFrame:
+    """
+    Parquet 파일에서 데이터를 로드합니다.
+
+    xlsx 대신 Parquet으로 내려받는 워크플로우용 — 파싱이 수십 배 빠르고,
+    pyarrow 문자열 백엔드는 object dtype 대비 메모리를 절반 수준으로 줄입니다.
+
+    Args:
+        uploaded_file: Streamlit 업로드된 파일 객체
+
+    Returns:
+        DataFrame
+
+    Raises:
+        ExcelLoadError: 파일 로딩 실패 시
+    """
+    try:
+        _rewind(uploaded_file)
+        try:
+            df = pd.read_parquet(uploaded_file, engine="pyarrow", dtype_backend="pyarrow")
+        except TypeError:
+            # pandas < 2: dtype_backend 미지원
+            _rewind(uploaded_file)
+            df = pd.read_parquet(uploaded_file, engine="pyarrow")
+
+        if df.empty:
+            raise ExcelLoadError("Parquet 파일에 데이터가 없습니다.")
+        return df
+
+    except ExcelLoadError:
+        raise
+    except Exception as e:
+        raise ExcelLoadError(f"Parquet 파일 로딩 중 오류가 발생했습니다: {str(e)}")
+
 def load_snapshot_from_excel(uploaded_file) -> pd.DataFrame:
     """
     Excel 파일에서 스냅샷 데이터를 로드합니다.
-    
+
+    시트 이름만 먼저 훑어 대상 시트를 고른 뒤 그 시트 하나만 파싱합니다.
+
     Args:
         uploaded_file: Streamlit 업로드된 파일 객체
-    
+
     Returns:
         스냅샷 DataFrame
     """
     try:
-        excel_data = load_from_excel(uploaded_file)
-        
+        sheet_names = list_sheets(uploaded_file)
+
         # 스냅샷 시트 찾기
-        snapshot_sheets = [name for name in excel_data.keys() 
+        snapshot_sheets = [name for name in sheet_names
                           if 'snapshot' in name.lower() or '재고' in name]
-        
+
         if not snapshot_sheets:
             # 첫 번째 시트 사용
-            sheet_name = list(excel_data.keys())[0]
+            sheet_name = sheet_names[0]
         else:
             sheet_name = snapshot_sheets[0]
-        
-        return excel_data[sheet_name]
-        
+
+        return read_sheet(uploaded_file, sheet_name)
+
     except Exception as e:
         raise ExcelLoadError(f"스냅샷 데이터 로딩 중 오류가 발생했습니다: {str(e)}")
 
 def load_moves_from_excel(uploaded_file) -> pd.DataFrame:
     """
     Excel 파일에서 이동 데이터를 로드합니다.
-    
+
+    시트 이름만 먼저 훑어 대상 시트를 고른 뒤 그 시트 하나만 파싱합니다.
+
     Args:
         uploaded_file: Streamlit 업로드된 파일 객체
-    
+
     Returns:
         이동 데이터 DataFrame
     """
     try:
-        excel_data = load_from_excel(uploaded_file)
-        
+        sheet_names = list_sheets(uploaded_file)
+
         # 이동 데이터 시트 찾기
-        moves_sheets = [name for name in excel_data.keys() 
+        moves_sheets = [name for name in sheet_names
                        if 'move' in name.lower() or '이동' in name or 'transaction' in name.lower()]
-        
+
         if not moves_sheets:
             # 두 번째 시트 사용 (첫 번째는 스냅샷으로 가정)
-            if len(excel_data) > 1:
-                sheet_name = list(excel_data.keys())[1]
+            if len(sheet_names) > 1:
+                sheet_name = sheet_names[1]
             else:
-                sheet_name = list(excel_data.keys())[0]
+                sheet_name = sheet_names[0]
         else:
             sheet_name = moves_sheets[0]
-        
-        return excel_data[sheet_name]
-        
+
+        return read_sheet(uploaded_file, sheet_name)
+
     except Exception as e:
         raise ExcelLoadError(f"이동 데이터 로딩 중 오류가 발생했습니다: {str(e)}")
@@ -1,3 +1,4 @@
+import functools
 import pandas as pd
 import streamlit as st
 from typing import Optional, Dict, Any
@@ -7,6 +8,45 @@ class GoogleSheetsLoadError(Exception):
     """Google Sheets 로딩 에러"""
     pass
 
+@functools.lru_cache(maxsize=4)
+def _authorized_client(creds_json: str):
+    """자격 증명(정렬된 JSON 문자열) 기준으로 인증된 gspread 클라이언트를 캐시합니다.
+
+    로더 세 개가 각자 재인증하던 것을 프로세스당 한 번으로 줄인다.
+    """
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    scopes = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+    creds = Credentials.from_service_account_info(json.loads(creds_json), scopes=scopes)
+    return gspread.authorize(creds)
+
+def _open_spreadsheet(gsheet_id: str, credentials: Optional[Dict[str, Any]]):
+    """공용 진입점: secrets 해석 → 캐시된 클라이언트 → 스프레드시트 열기."""
+    if credentials is None:
+        # Streamlit secrets에서 인증 정보 가져오기
+        if 'gsheets' not in st.secrets:
+            raise GoogleSheetsLoadError("Google Sheets 인증 정보가 설정되지 않았습니다.")
+        credentials = st.secrets['gsheets']
+
+    gc = _authorized_client(json.dumps(dict(credentials), sort_keys=True))
+    return gc.open_by_key(gsheet_id)
+
+def _records_frame(worksheet) -> pd.DataFrame:
+    """워크시트 값을 2차원 리스트로 받아 DataFrame을 한 번에 구성합니다.
+
+    get_all_records()는 행마다 dict를 만들었다가 다시 컬럼으로 분해하는
+    이중 O(rows×cols) 경로라, 원시 값 리스트에서 바로 만드는 쪽이 훨씬 싸다.
+    """
+    raw = worksheet.get_values(value_render_option='UNFORMATTED_VALUE')
+    if not raw or len(raw) < 2:
+        return pd.DataFrame()
+    header = [str(c).strip() for c in raw[0]]
+    body = [r + [""] * (len(header) - len(r)) if len(r) < len(header) else r[:len(header)]
+            for r in raw[1:]]
+    return pd.DataFrame(body, columns=header)
+
+@st.cache_data(ttl=300, show_spinner=False)
 def load_from_gsheet_api(
     gsheet_id: str,
     sheet_name: Optional[str] = None,
@@ -27,37 +67,20 @@ def load_from_gsheet_api(
         GoogleSheetsLoadError: 로딩 실패 시
     """
     try:
-        import gspread
-        from google.oauth2.service_account import Credentials
-        
-        if credentials is None:
-            # Streamlit secrets에서 인증 정보 가져오기
-            if 'gsheets' not in st.secrets:
-                raise GoogleSheetsLoadError("Google Sheets 인증 정보가 설정되지 않았습니다.")
-            credentials = st.secrets['gsheets']
-        
-        # 인증 설정
-        scopes = ['https://www.googleapis.com/auth/spreadsheets.readonly']
-        creds = Credentials.from_service_account_info(credentials, scopes=scopes)
-        gc = gspread.authorize(creds)
-        
-        # 스프레드시트 열기
-        spreadsheet = gc.open_by_key(gsheet_id)
-        
+        # 스프레드시트 열기 (인증은 프로세스 단위로 캐시)
+        spreadsheet = _open_spreadsheet(gsheet_id, credentials)
+
         if sheet_name:
             worksheet = spreadsheet.worksheet(sheet_name)
         else:
             worksheet = spreadsheet.sheet1
         
-        # 데이터 가져오기
-        records = worksheet.get_all_records()
-        
-        if not records:
+        # 데이터 가져오기 (원시 값 → DataFrame 직행)
+        df = _records_frame(worksheet)
+
+        if df.empty:
             raise GoogleSheetsLoadError("시트에 데이터가 없습니다.")
-        
-        # DataFrame으로 변환
-        df = pd.DataFrame(records)
-        
+
         # 빈 행 제거
         df = df.dropna(how='all')
         
@@ -74,6 +97,7 @@ def load_from_gsheet_api(
     except Exception as e:
         raise GoogleSheetsLoadError(f"Google Sheets 로딩 중 오류가 발생했습니다: {str(e)}")
 
+@st.cache_data(ttl=300, show_spinner=False)
 def load_snapshot_from_gsheet(
     gsheet_id: str,
     credentials: Optional[Dict[str, Any]] = None
@@ -89,22 +113,9 @@ def load_snapshot_from_gsheet(
         스냅샷 DataFrame
     """
     try:
-        import gspread
-        from google.oauth2.service_account import Credentials
-        
-        if credentials is None:
-            if 'gsheets' not in st.secrets:
-                raise GoogleSheetsLoadError("Google Sheets 인증 정보가 설정되지 않았습니다.")
-            credentials = st.secrets['gsheets']
-        
-        # 인증 설정
-        scopes = ['https://www.googleapis.com/auth/spreadsheets.readonly']
-        creds = Credentials.from_service_account_info(credentials, scopes=scopes)
-        gc = gspread.authorize(creds)
-        
-        # 스프레드시트 열기
-        spreadsheet = gc.open_by_key(gsheet_id)
-        
+        # 스프레드시트 열기 (인증은 프로세스 단위로 캐시)
+        spreadsheet = _open_spreadsheet(gsheet_id, credentials)
+
         # 스냅샷 시트 찾기
         worksheets = spreadsheet.worksheets()
         snapshot_sheet = None
@@ -117,9 +128,8 @@ def load_snapshot_from_gsheet(
         if snapshot_sheet is None:
             snapshot_sheet = worksheets[0]  # 첫 번째 시트 사용
         
-        # 데이터 가져오기
-        records = snapshot_sheet.get_all_records()
-        df = pd.DataFrame(records)
+        # 데이터 가져오기 (원시 값 → DataFrame 직행)
+        df = _records_frame(snapshot_sheet)
         df = df.dropna(how='all')
         
         if df.empty:
@@ -130,6 +140,7 @@ def load_snapshot_from_gsheet(
     except Exception as e:
         raise GoogleSheetsLoadError(f"스냅샷 데이터 로딩 중 오류가 발생했습니다: {str(e)}")
 
+@st.cache_data(ttl=300, show_spinner=False)
 def load_moves_from_gsheet(
     gsheet_id: str,
     credentials: Optional[Dict[str, Any]] = None
@@ -145,22 +156,9 @@ def load_moves_from_gsheet(
         이동 데이터 DataFrame
     """
     try:
-        import gspread
-        from google.oauth2.service_account import Credentials
-        
-        if credentials is None:
-            if 'gsheets' not in st.secrets:
-                raise GoogleSheetsLoadError("Google Sheets 인증 정보가 설정되지 않았습니다.")
-            credentials = st.secrets['gsheets']
-        
-        # 인증 설정
-        scopes = ['https://www.googleapis.com/auth/spreadsheets.readonly']
-        creds = Credentials.from_service_account_info(credentials, scopes=scopes)
-        gc = gspread.authorize(creds)
-        
-        # 스프레드시트 열기
-        spreadsheet = gc.open_by_key(gsheet_id)
-        
+        # 스프레드시트 열기 (인증은 프로세스 단위로 캐시)
+        spreadsheet = _open_spreadsheet(gsheet_id, credentials)
+
         # 이동 데이터 시트 찾기
         worksheets = spreadsheet.worksheets()
         moves_sheet = None
@@ -176,9 +174,8 @@ def load_moves_from_gsheet(
             else:
                 moves_sheet = worksheets[0]  # 첫 번째 시트 사용
         
-        # 데이터 가져오기
-        records = moves_sheet.get_all_records()
-        df = pd.DataFrame(records)
+        # 데이터 가져오기 (원시 값 → DataFrame 직행)
+        df = _records_frame(moves_sheet)
         df = df.dropna(how='all')
         
         if df.empty:
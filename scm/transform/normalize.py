@@ -7,10 +7,59 @@ class NormalizationError(Exception):
     """데이터 정규화 에러"""
     pass
 
+# 자동 매핑용 키워드 집합 (소문자 기준) — 호출마다 리스트를 다시 만들지 않음
+_SKU_KEYWORDS = frozenset({"sku", "product", "item"})
+_DATE_KEYWORDS = frozenset({"date", "time"})
+_QTY_KEYWORDS = frozenset({"qty", "quantity"})
+
+# 센터 → 원본 재고 컬럼 후보 매핑 — 호출마다 dict를 다시 만들지 않도록 모듈 상수로.
+# AcrossBUS/어크로스비US는 같은 재고 컬럼을 공유하는 별칭이다.
+_CENTER_MAPPING = {
+    "태광KR": ["stock2"],
+    "AMZUS": ["fba_available_stock"],
+    "품고KR": ["poomgo_v2_available_stock"],
+    "SBSPH": ["shopee_ph_available_stock"],
+    "SBSSG": ["shopee_sg_available_stock"],
+    "SBSMY": ["shopee_my_available_stock"],
+    "AcrossBUS": ["acrossb_available_stock"],
+    "어크로스비US": ["acrossb_available_stock"],
+}
+
+def _find_by_keywords(lower_map: Dict[str, str], keywords: frozenset) -> List[str]:
+    """소문자 컬럼명 맵에서 키워드가 포함된 원본 컬럼명들을 찾습니다."""
+    return [orig for low, orig in lower_map.items()
+            if any(k in low for k in keywords)]
+
 def _flatten_candidates(candidates: List[str]) -> str:
     """후보 컬럼명들을 하나의 문자열로 합칩니다."""
     return " | ".join(candidates)
 
+def _to_datetime_fast(s: pd.Series) -> pd.Series:
+    """날짜 컬럼을 변환합니다 — 포맷 추론을 건너뛰는 빠른 경로 우선.
+
+    첫 유효 값이 문자열이면 지정 포맷(C 경로)으로 시도합니다. 단,
+    errors="coerce"는 포맷 불일치를 예외 대신 NaT로 흡수하므로 결과만
+    믿으면 비ISO 컬럼('01/05/2024' 등)이 통째로 NaT가 됩니다 — 빠른
+    경로가 기존 유효 값을 하나라도 NaT로 만들면 버리고 추론 경로로
+    폴백합니다. cache=True로 중복 날짜 값의 재파싱을 피합니다.
+    """
+    non_null = s.dropna()
+    n_valid = len(non_null)
+    first = non_null.iloc[0] if n_valid else None
+    if isinstance(first, str):
+        # 가장 흔한 '%Y-%m-%d'는 정확한 포맷을 지정하는 편이 ISO8601 판별보다 빠름
+        candidates = ["ISO8601"]
+        if len(first) == 10 and first[4] == "-" and first[7] == "-":
+            candidates.insert(0, "%Y-%m-%d")
+        for fmt in candidates:
+            try:
+                out = pd.to_datetime(s, errors="coerce", format=fmt, cache=True)
+            except (ValueError, TypeError):
+                continue
+            if int(out.notna().sum()) == n_valid:
+                return out
+    return pd.to_datetime(s, errors="coerce", cache=True)
+
 def coalesce_columns(df: pd.DataFrame, column_mapping: Dict[str, List[str]]) -> pd.DataFrame:
     """
     여러 컬럼을 하나로 합칩니다.
@@ -22,25 +71,70 @@ def coalesce_columns(df: pd.DataFrame, column_mapping: Dict[str, List[str]]) ->
     Returns:
         정규화된 DataFrame
     """
-    result = df.copy()
-    
+    # 후보가 하나뿐인 키는 rename 한 번으로 처리하고,
+    # 여러 후보가 공존하는 키만 값 채우기 루프를 돈다
+    rename_map = {}
+    multi_candidate = {}
     for new_col, old_cols in column_mapping.items():
         # 기존 컬럼들 중 존재하는 것들만 선택
         existing_cols = [col for col in old_cols if col in df.columns]
-        
+
         if not existing_cols:
             continue
-        
-        # 첫 번째로 존재하는 컬럼의 값을 사용
-        result[new_col] = df[existing_cols[0]]
-        
-        # 나머지 컬럼들도 확인하여 누락된 값 채우기
-        for col in existing_cols[1:]:
-            mask = result[new_col].isna() & df[col].notna()
-            result.loc[mask, new_col] = df.loc[mask, col]
-    
+
+        if len(existing_cols) == 1:
+            if existing_cols[0] != new_col:
+                rename_map[existing_cols[0]] = new_col
+        else:
+            multi_candidate[new_col] = existing_cols
+
+    # CoW 하에서는 얕은 복사로 충분 — 이후 컬럼 대입 시 해당 컬럼만 복사된다
+    result = df.rename(columns=rename_map) if rename_map else df.copy(deep=False)
+
+    for new_col, existing_cols in multi_candidate.items():
+        # 후보 컬럼들을 가로(bfill)로 합쳐 행별 첫 유효 값을 한 번에 추출 —
+        # 후보마다 마스크를 만들어 .loc로 채우던 다중 패스를 제거
+        result[new_col] = df[existing_cols].bfill(axis=1).iloc[:, 0]
+
     return result
 
+def _melt_centers(result: pd.DataFrame, center_columns: Dict[str, str]) -> pd.DataFrame:
+    """센터별 재고 컬럼(wide)을 long format으로 변환합니다.
+
+    센터별 슬라이스 concat 대신 melt 한 번으로 처리하고, 같은 재고 컬럼을
+    공유하는 센터 별칭(AcrossBUS/어크로스비US)은 (센터, 재고컬럼) 매핑
+    프레임과의 join으로 행을 복제한다. polars가 설치돼 있으면 Arrow 기반
+    melt+join 경로를 쓰고, 없거나 변환 불가한 dtype이면 pandas로 폴백.
+    """
+    value_vars = sorted(set(center_columns.values()))
+    mapping = pd.DataFrame(
+        list(center_columns.items()), columns=["center", "stock_col"]
+    )
+
+    try:
+        import polars as pl
+
+        melted = (
+            pl.from_pandas(result[["resource_code", "date"] + value_vars])
+            .melt(id_vars=["resource_code", "date"], value_vars=value_vars,
+                  variable_name="stock_col", value_name="stock_qty")
+            .join(pl.from_pandas(mapping), on="stock_col")
+            .select(["resource_code", "center", "date", "stock_qty"])
+        )
+        return melted.to_pandas()
+    except ImportError:
+        pass
+    except Exception:
+        # 변환 불가한 object dtype 등 — pandas 경로로 폴백
+        pass
+
+    melted = result.melt(
+        id_vars=["resource_code", "date"], value_vars=value_vars,
+        var_name="stock_col", value_name="stock_qty",
+    )
+    return (melted.merge(mapping, on="stock_col")
+            [["resource_code", "center", "date", "stock_qty"]])
+
 def normalize_refined_snapshot(df: pd.DataFrame) -> pd.DataFrame:
     """
     정제된 스냅샷 데이터를 정규화합니다.
@@ -53,8 +147,9 @@ def normalize_refined_snapshot(df: pd.DataFrame) -> pd.DataFrame:
     """
     if df.empty:
         raise NormalizationError("스냅샷 데이터가 비어있습니다.")
-    
-    result = df.copy()
+
+    # 전체 딥카피 대신 얕은 복사 — CoW가 수정 컬럼만 복사해 메모리 절약
+    result = df.copy(deep=False)
     
     # 컬럼명 정규화
     result.columns = result.columns.astype(str).str.strip()
@@ -72,15 +167,16 @@ def normalize_refined_snapshot(df: pd.DataFrame) -> pd.DataFrame:
     missing_cols = [col for col in required_cols if col not in result.columns]
     
     if missing_cols:
-        # 자동 매핑 시도
+        # 자동 매핑 시도 — 소문자 변환은 컬럼당 한 번만
+        lower_map = {c.lower(): c for c in result.columns}
         auto_mapping = {}
         for col in missing_cols:
             if col == "resource_code":
-                sku_candidates = [c for c in result.columns if any(keyword in c.lower() for keyword in ["sku", "product", "item"])]
+                sku_candidates = _find_by_keywords(lower_map, _SKU_KEYWORDS)
                 if sku_candidates:
                     auto_mapping[col] = sku_candidates[0]
             elif col == "date":
-                date_candidates = [c for c in result.columns if any(keyword in c.lower() for keyword in ["date", "time"])]
+                date_candidates = _find_by_keywords(lower_map, _DATE_KEYWORDS)
                 if date_candidates:
                     auto_mapping[col] = date_candidates[0]
         
@@ -94,22 +190,12 @@ def normalize_refined_snapshot(df: pd.DataFrame) -> pd.DataFrame:
             available_cols = list(result.columns)
             raise NormalizationError(f"필수 컬럼이 없습니다: {missing_cols}\n사용 가능한 컬럼: {available_cols}")
     
-    # 센터별 재고 컬럼 찾기 및 변환
+    # 센터별 재고 컬럼 찾기 — 모듈 상수 매핑과 set 교집합으로 탐지
+    colset = set(result.columns)
     center_columns = {}
-    center_mapping = {
-        "태광KR": ["stock2"],
-        "AMZUS": ["fba_available_stock"],
-        "품고KR": ["poomgo_v2_available_stock"],
-        "SBSPH": ["shopee_ph_available_stock"],
-        "SBSSG": ["shopee_sg_available_stock"],
-        "SBSMY": ["shopee_my_available_stock"],
-        "AcrossBUS": ["acrossb_available_stock"],
-        "어크로스비US": ["acrossb_available_stock"]
-    }
-    
-    for center, possible_cols in center_mapping.items():
+    for center, possible_cols in _CENTER_MAPPING.items():
         for col in possible_cols:
-            if col in result.columns:
+            if col in colset:
                 center_columns[center] = col
                 break
     
@@ -117,34 +203,40 @@ def normalize_refined_snapshot(df: pd.DataFrame) -> pd.DataFrame:
         raise NormalizationError("센터별 재고 컬럼을 찾을 수 없습니다.")
     
     # 데이터를 long format으로 변환
-    melted_data = []
-    
-    for center, stock_col in center_columns.items():
-        if stock_col in result.columns:
-            center_data = result[["resource_code", "date", stock_col]].copy()
-            center_data["center"] = center
-            center_data["stock_qty"] = center_data[stock_col]
-            center_data = center_data[["resource_code", "center", "date", "stock_qty"]]
-            melted_data.append(center_data)
-    
-    if not melted_data:
+    result = _melt_centers(result, center_columns)
+
+    if result.empty:
         raise NormalizationError("변환할 데이터가 없습니다.")
     
-    result = pd.concat(melted_data, ignore_index=True)
-    
     # 데이터 타입 변환
-    result["stock_qty"] = pd.to_numeric(result["stock_qty"], errors="coerce").fillna(0).astype(int)
-    result["date"] = pd.to_datetime(result["date"], errors="coerce")
-    
-    # 날짜가 없는 행 제거
-    result = result.dropna(subset=["date"])
-    
-    # 수량이 0인 행 제거
-    result = result[result["stock_qty"] > 0]
-    
-    # 중복 제거
-    result = result.drop_duplicates(subset=["resource_code", "center", "date"])
-    
+    # int32로 다운캐스트 — 재고 수량은 21억을 넘지 않고, 폭을 반으로 줄이면
+    # 이후 스캔/groupby/merge의 메모리 대역폭도 절반이 된다
+    result["stock_qty"] = pd.to_numeric(result["stock_qty"], errors="coerce").fillna(0).astype("int32")
+    result["date"] = _to_datetime_fast(result["date"])
+
+    # 저카디널리티 키 컬럼은 category로 캐스팅 — isin/groupby/비교가 정수 코드 연산이 됨
+    for col in ("center", "resource_code"):
+        result[col] = result[col].astype("category")
+
+    # 정리(날짜 결측 제거 + 수량>0 + 키 중복 제거)를 정렬 기반 한 패스로 통합 —
+    # dropna/filter/drop_duplicates 세 번의 전체 스캔과 해시맵 구축을 대체.
+    # lexsort는 안정 정렬이라 키가 같은 행 중 원본에서 앞선 행이 남는다
+    # (drop_duplicates keep='first'와 동일).
+    date_i8 = result["date"].to_numpy("datetime64[ns]").view("i8")
+    qty = result["stock_qty"].to_numpy()
+    rc = result["resource_code"].cat.codes.to_numpy()
+    ct = result["center"].cat.codes.to_numpy()
+
+    valid = (date_i8 != np.iinfo(np.int64).min) & (qty > 0)  # NaT는 int64 최솟값
+    order = np.lexsort((date_i8, ct, rc))
+    order = order[valid[order]]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = ((rc[order][1:] != rc[order][:-1]) |
+                 (ct[order][1:] != ct[order][:-1]) |
+                 (date_i8[order][1:] != date_i8[order][:-1]))
+    keep = np.sort(order[first])  # 원래 행 순서 복원
+    result = result.iloc[keep]
+
     return result
 
 def normalize_moves(df: pd.DataFrame) -> pd.DataFrame:
@@ -159,8 +251,9 @@ def normalize_moves(df: pd.DataFrame) -> pd.DataFrame:
     """
     if df.empty:
         raise NormalizationError("이동 데이터가 비어있습니다.")
-    
-    result = df.copy()
+
+    # 전체 딥카피 대신 얕은 복사 — CoW가 수정 컬럼만 복사해 메모리 절약
+    result = df.copy(deep=False)
     
     # 컬럼명 정규화
     result.columns = result.columns.astype(str).str.strip()
@@ -184,15 +277,16 @@ def normalize_moves(df: pd.DataFrame) -> pd.DataFrame:
     missing_cols = [col for col in required_cols if col not in result.columns]
     
     if missing_cols:
-        # 자동 매핑 시도
+        # 자동 매핑 시도 — 소문자 변환은 컬럼당 한 번만
+        lower_map = {c.lower(): c for c in result.columns}
         auto_mapping = {}
         for col in missing_cols:
             if col == "resource_code":
-                sku_candidates = [c for c in result.columns if any(keyword in c.lower() for keyword in ["sku", "product", "item"])]
+                sku_candidates = _find_by_keywords(lower_map, _SKU_KEYWORDS)
                 if sku_candidates:
                     auto_mapping[col] = sku_candidates[0]
             elif col == "qty_ea":
-                qty_candidates = [c for c in result.columns if any(keyword in c.lower() for keyword in ["qty", "quantity"])]
+                qty_candidates = _find_by_keywords(lower_map, _QTY_KEYWORDS)
                 if qty_candidates:
                     auto_mapping[col] = qty_candidates[0]
         
@@ -213,18 +307,24 @@ def normalize_moves(df: pd.DataFrame) -> pd.DataFrame:
         result["to_center"] = "Unknown"
     
     # 데이터 타입 변환
-    result["qty_ea"] = pd.to_numeric(result["qty_ea"], errors="coerce").fillna(0).astype(int)
+    # int32로 다운캐스트 — 수량 컬럼 폭을 절반으로 줄여 메모리 대역폭 절약
+    result["qty_ea"] = pd.to_numeric(result["qty_ea"], errors="coerce").fillna(0).astype("int32")
     
     # 날짜 컬럼들 변환
     date_cols = ["onboard_date", "arrival_date", "inbound_date"]
     for col in date_cols:
         if col in result.columns:
-            result[col] = pd.to_datetime(result[col], errors="coerce")
+            result[col] = _to_datetime_fast(result[col])
     
     # 수량이 0인 행 제거
     result = result[result["qty_ea"] > 0]
-    
+
     # 중복 제거
     result = result.drop_duplicates()
-    
+
+    # 저카디널리티 키 컬럼은 category로 캐스팅 — isin/groupby/비교가 정수 코드 연산이 됨
+    for col in ("resource_code", "from_center", "to_center", "carrier_mode"):
+        if col in result.columns:
+            result[col] = result[col].astype("category")
+
     return result
@@ -1,43 +1,6 @@
 import pandas as pd
 import numpy as np
 from typing import List, Optional, Dict, Any
-import re
-
-def _parse_po_date(date_str: str) -> Optional[pd.Timestamp]:
-    """
-    PO 날짜 문자열을 파싱합니다.
-    
-    Args:
-        date_str: 날짜 문자열
-    
-    Returns:
-        파싱된 Timestamp 또는 None
-    """
-    if pd.isna(date_str) or date_str == "":
-        return None
-    
-    try:
-        # 다양한 날짜 형식 시도
-        date_formats = [
-            "%Y-%m-%d",
-            "%Y/%m/%d", 
-            "%m/%d/%Y",
-            "%d/%m/%Y",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y/%m/%d %H:%M:%S"
-        ]
-        
-        for fmt in date_formats:
-            try:
-                return pd.to_datetime(date_str, format=fmt)
-            except ValueError:
-                continue
-        
-        # 자동 파싱 시도
-        return pd.to_datetime(date_str, errors="coerce")
-        
-    except Exception:
-        return None
 
 def load_wip_from_incoming(
     moves: pd.DataFrame,
@@ -64,49 +27,48 @@ def load_wip_from_incoming(
             if any(keyword in col_lower for keyword in ["po", "purchase", "order", "wip", "work"]):
                 wip_columns.append(col)
     
+    empty = pd.DataFrame(columns=["resource_code", "po_number", "po_date", "qty_ea", "status"])
     if not wip_columns:
-        return pd.DataFrame(columns=["resource_code", "po_number", "po_date", "qty_ea", "status"])
-    
-    # WIP 데이터 추출
-    wip_data = []
-    
-    for _, row in moves.iterrows():
-        # PO 번호 찾기
-        po_number = None
-        for col in wip_columns:
-            if "po" in col.lower() and "number" in col.lower():
-                po_number = row[col]
-                break
-        
-        if pd.isna(po_number) or po_number == "":
-            continue
-        
-        # PO 날짜 찾기
-        po_date = None
-        for col in wip_columns:
-            if "po" in col.lower() and "date" in col.lower():
-                po_date = _parse_po_date(row[col])
-                break
-        
-        # 수량 찾기
-        qty = row.get("qty_ea", 0)
-        if pd.isna(qty) or qty <= 0:
-            continue
-        
-        # 상태 결정
-        status = "In Production"
-        if po_date and po_date < pd.Timestamp.today():
-            status = "Delayed"
-        
-        wip_data.append({
-            "resource_code": row.get("resource_code", ""),
-            "po_number": str(po_number),
-            "po_date": po_date,
-            "qty_ea": int(qty),
-            "status": status
-        })
-    
-    return pd.DataFrame(wip_data)
+        return empty
+
+    # PO 번호/날짜 컬럼은 행 루프 밖에서 한 번만 탐지
+    po_col = next((c for c in wip_columns
+                   if "po" in c.lower() and "number" in c.lower()), None)
+    date_col = next((c for c in wip_columns
+                     if "po" in c.lower() and "date" in c.lower()), None)
+    if po_col is None:
+        return empty
+
+    # 행 단위 iterrows 대신 컬럼 단위 벡터 연산으로 일괄 추출
+    po_number = moves[po_col]
+    if date_col is not None:
+        # 컬럼 전체를 한 번에 파싱 — 행마다 포맷 후보를 순회하던 경로 제거
+        try:
+            po_date = pd.to_datetime(moves[date_col], errors="coerce", format="mixed")
+        except (TypeError, ValueError):
+            # pandas < 2: format="mixed" 미지원
+            po_date = pd.to_datetime(moves[date_col], errors="coerce")
+    else:
+        po_date = pd.Series(pd.NaT, index=moves.index)
+    qty = pd.to_numeric(
+        moves["qty_ea"] if "qty_ea" in moves.columns else pd.Series(0, index=moves.index),
+        errors="coerce",
+    )
+    resource = (moves["resource_code"] if "resource_code" in moves.columns
+                else pd.Series("", index=moves.index))
+
+    keep = po_number.notna() & (po_number.astype(str) != "") & qty.notna() & (qty > 0)
+
+    out = pd.DataFrame({
+        "resource_code": resource,
+        "po_number": po_number.astype(str),
+        "po_date": po_date,
+        "qty_ea": qty.fillna(0).astype(int),
+        # 상태: PO 날짜가 있고 오늘 이전이면 지연
+        "status": np.where(po_date.notna() & (po_date < pd.Timestamp.today()),
+                           "Delayed", "In Production"),
+    })
+    return out[keep.to_numpy()].reset_index(drop=True)
 
 def merge_wip_as_moves(
     moves: pd.DataFrame,
@@ -126,31 +88,25 @@ def merge_wip_as_moves(
     """
     if wip_data.empty:
         return moves
-    
-    # WIP를 이동 데이터로 변환
-    wip_moves = []
-    
-    for _, wip in wip_data.iterrows():
-        # 예상 도착일 계산
-        if pd.notna(wip["po_date"]):
-            expected_arrival = wip["po_date"] + pd.Timedelta(days=wip_lead_days)
-        else:
-            expected_arrival = pd.Timestamp.today() + pd.Timedelta(days=wip_lead_days)
-        
-        wip_moves.append({
-            "resource_code": wip["resource_code"],
-            "from_center": "WIP",
-            "to_center": "Unknown",  # 실제 도착지가 명시되지 않은 경우
-            "qty_ea": wip["qty_ea"],
-            "onboard_date": wip["po_date"],
-            "arrival_date": expected_arrival,
-            "inbound_date": None,
-            "carrier_mode": "WIP",
-            "po_number": wip["po_number"],
-            "status": wip["status"]
-        })
-    
-    wip_moves_df = pd.DataFrame(wip_moves)
+
+    # WIP를 이동 데이터로 변환 — 행 루프 없이 컬럼 연산으로 한 번에 구성
+    # 예상 도착일: PO 날짜(없으면 오늘) + 리드 타임
+    expected_arrival = (
+        wip_data["po_date"].fillna(pd.Timestamp.today())
+        + pd.Timedelta(days=wip_lead_days)
+    )
+    wip_moves_df = pd.DataFrame({
+        "resource_code": wip_data["resource_code"],
+        "from_center": "WIP",
+        "to_center": "Unknown",  # 실제 도착지가 명시되지 않은 경우
+        "qty_ea": wip_data["qty_ea"],
+        "onboard_date": wip_data["po_date"],
+        "arrival_date": expected_arrival,
+        "inbound_date": pd.NaT,
+        "carrier_mode": "WIP",
+        "po_number": wip_data["po_number"],
+        "status": wip_data["status"],
+    })
     
     # 기존 이동 데이터와 병합
     if moves.empty:
@@ -1,9 +1,16 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from typing import List, Optional
 
+# 트레이스당 이 점수를 넘으면 일 단위로 다운샘플 (JSON 직렬화/렌더 비용 절감)
+_MAX_TRACE_POINTS = 2000
+
+def _downsample_trace(center_data: pd.DataFrame) -> pd.DataFrame:
+    """트레이스 점수가 과도하면 일 단위 마지막 값으로 리샘플합니다."""
+    if len(center_data) > _MAX_TRACE_POINTS:
+        return center_data.set_index("date").resample("D").last().reset_index()
+    return center_data
+
 def plot_step_chart(
     timeline_df: pd.DataFrame,
     start_dt: pd.Timestamp,
@@ -23,34 +30,39 @@ def plot_step_chart(
         show_wip: WIP 라인 표시 여부
         show_transit: In-Transit 라인 표시 여부
     """
+    # plotly는 import 비용이 커서 차트를 실제로 그릴 때만 로드
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     if timeline_df.empty:
         st.info("차트를 그릴 데이터가 없습니다.")
         return
-    
+
     if today is None:
         today = pd.Timestamp.today().normalize()
     
     # 데이터 필터링
+    # 이후 연산은 모두 읽기 전용 — 방어적 copy 불필요
     vis_df = timeline_df[
-        (timeline_df["date"] >= start_dt) & 
+        (timeline_df["date"] >= start_dt) &
         (timeline_df["date"] <= end_dt)
-    ].copy()
+    ]
     
     if vis_df.empty:
         st.info("선택된 기간에 데이터가 없습니다.")
         return
-    
+
     # 차트 생성
     fig = go.Figure()
-    
+
     # 센터별 라인 (실선)
     centers = vis_df[vis_df["center"] != "In-Transit"]["center"].unique()
     colors = px.colors.qualitative.Set1
-    
+
     for i, center in enumerate(centers):
-        center_data = vis_df[vis_df["center"] == center]
+        center_data = _downsample_trace(vis_df[vis_df["center"] == center])
         if not center_data.empty:
-            fig.add_trace(go.Scatter(
+            fig.add_trace(go.Scattergl(
                 x=center_data["date"],
                 y=center_data["stock_qty"],
                 mode='lines+markers',
@@ -65,9 +77,9 @@ def plot_step_chart(
     
     # In-Transit 라인 (점선)
     if show_transit:
-        transit_data = vis_df[vis_df["center"] == "In-Transit"]
+        transit_data = _downsample_trace(vis_df[vis_df["center"] == "In-Transit"])
         if not transit_data.empty:
-            fig.add_trace(go.Scatter(
+            fig.add_trace(go.Scattergl(
                 x=transit_data["date"],
                 y=transit_data["stock_qty"],
                 mode='lines+markers',
@@ -107,7 +119,7 @@ def plot_step_chart(
     )
     
     # Y축 포맷
-    fig.update_yaxis(tickformat=",")
+    fig.update_layout(yaxis_tickformat=",")
     
     # 차트 표시
     st.plotly_chart(fig, use_container_width=True)
@@ -127,19 +139,23 @@ def plot_inventory_distribution(
         skus_sel: 선택된 SKU 목록
         latest_dt: 최신 날짜
     """
+    import plotly.express as px
+
     # 데이터 필터링
+    # 이후 연산은 모두 읽기 전용 — 방어적 copy 불필요
     data = snap_long[
         (snap_long["date"] == latest_dt) &
         (snap_long["center"].isin(centers_sel)) &
         (snap_long["resource_code"].isin(skus_sel))
-    ].copy()
+    ]
     
     if data.empty:
         st.info("차트를 그릴 데이터가 없습니다.")
         return
     
     # 센터별 재고 집계
-    center_stock = data.groupby("center")["stock_qty"].sum().reset_index()
+    # observed=True: category 키에서 미관측 센터의 0행이 생기지 않도록
+    center_stock = data.groupby("center", observed=True)["stock_qty"].sum().reset_index()
     
     # 파이 차트
     fig = px.pie(
@@ -175,12 +191,15 @@ def plot_sku_trend(
         start_dt: 시작 날짜
         end_dt: 종료 날짜
     """
+    import plotly.graph_objects as go
+
     # SKU 데이터 필터링
+    # 이후 연산은 모두 읽기 전용 — 방어적 copy 불필요
     sku_data = timeline_df[
         (timeline_df["resource_code"] == sku) &
         (timeline_df["date"] >= start_dt) &
         (timeline_df["date"] <= end_dt)
-    ].copy()
+    ]
     
     if sku_data.empty:
         st.info(f"SKU '{sku}'에 대한 데이터가 없습니다.")
@@ -193,12 +212,12 @@ def plot_sku_trend(
     centers = sku_data["center"].unique()
     
     for center in centers:
-        center_data = sku_data[sku_data["center"] == center]
+        center_data = _downsample_trace(sku_data[sku_data["center"] == center])
         if not center_data.empty:
             line_style = 'dash' if center == "In-Transit" else 'solid'
             line_width = 2 if center == "In-Transit" else 3
-            
-            fig.add_trace(go.Scatter(
+
+            fig.add_trace(go.Scattergl(
                 x=center_data["date"],
                 y=center_data["stock_qty"],
                 mode='lines+markers',
@@ -220,7 +239,7 @@ def plot_sku_trend(
     )
     
     # Y축 포맷
-    fig.update_yaxis(tickformat=",")
+    fig.update_layout(yaxis_tickformat=",")
     
     # 차트 표시
     st.plotly_chart(fig, use_container_width=True)
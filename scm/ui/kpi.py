@@ -1,34 +1,38 @@
 import streamlit as st
 import pandas as pd
-from typing import List, Dict, Any
+import numpy as np
+from typing import List, Dict, Any, Optional
 
-def render_kpis(
-    snap_long: pd.DataFrame,
+from scm._kernels import HAVE_NUMBA, in_transit_total as _in_transit_kernel
+
+def _latest_slice(snap_long: pd.DataFrame, latest_dt: pd.Timestamp) -> pd.DataFrame:
+    """최신 날짜 스냅샷 행만 잘라 반환합니다 (렌더러 간 공유용)."""
+    return snap_long[snap_long["date"] == latest_dt]
+
+@st.cache_data(show_spinner=False)
+def _compute_kpis(
+    latest_snap: pd.DataFrame,
     moves: pd.DataFrame,
-    centers_sel: List[str],
-    skus_sel: List[str],
-    latest_dt: pd.Timestamp,
+    centers_sel: tuple,
+    skus_sel: tuple,
     today: pd.Timestamp,
-    lag_days: int = 7
-) -> None:
-    """
-    KPI 카드들을 렌더링합니다.
-    
-    Args:
-        snap_long: 정규화된 스냅샷 데이터
-        moves: 이동 데이터
-        centers_sel: 선택된 센터 목록
-        skus_sel: 선택된 SKU 목록
-        latest_dt: 최신 날짜
-        today: 오늘 날짜
-        lag_days: 도착-입고 지연 일수
+    lag_days: int
+) -> Dict[str, float]:
+    """KPI 스칼라(현재/이동중/WIP 재고)를 계산합니다.
+
+    순수 계산부만 분리해 st.cache_data로 메모이즈 — 위젯 조작만 있는
+    rerun에서는 마스크/합산이 다시 실행되지 않는다.
     """
+    # 수량 배열을 한 번만 뽑아 numpy 마스크 합산으로 처리 —
+    # frame[mask] 중간 프레임(전체 컬럼 복사) 생성을 피한다
+    qty = pd.to_numeric(moves["qty_ea"], errors="coerce").fillna(0).to_numpy(np.float64)
+
     # 현재 재고 계산
-    current_stock = snap_long[
-        (snap_long["date"] == latest_dt) &
-        (snap_long["center"].isin(centers_sel)) &
-        (snap_long["resource_code"].isin(skus_sel))
-    ]["stock_qty"].sum()
+    stock_mask = (
+        latest_snap["center"].isin(centers_sel) &
+        latest_snap["resource_code"].isin(skus_sel)
+    ).to_numpy()
+    current_stock = latest_snap["stock_qty"].to_numpy()[stock_mask].sum()
     
     # 이동중 재고 계산 (Non-WIP)
     in_transit_mask = (
@@ -44,29 +48,80 @@ def render_kpis(
             (moves["onboard_date"] <= today)
         )
     
-    # 예측 입고일 계산
-    moves_copy = moves.copy()
-    moves_copy["pred_inbound_date"] = moves_copy["inbound_date"]
-    mask = moves_copy["pred_inbound_date"].isna() & moves_copy["arrival_date"].notna()
-    fut = mask & (moves_copy["arrival_date"] > today)
-    past = mask & (moves_copy["arrival_date"] <= today)
-    
-    moves_copy.loc[fut, "pred_inbound_date"] = moves_copy.loc[fut, "arrival_date"]
-    moves_copy.loc[past, "pred_inbound_date"] = moves_copy.loc[past, "arrival_date"] + pd.Timedelta(days=lag_days)
-    moves_copy["pred_end_date"] = moves_copy["pred_inbound_date"]
-    moves_copy.loc[moves_copy["pred_end_date"].isna(), "pred_end_date"] = today + pd.Timedelta(days=1)
-    
-    in_transit_total = moves_copy[
-        in_transit_mask & (today < moves_copy["pred_end_date"])
-    ]["qty_ea"].sum()
+    _day_ns = np.int64(86_400_000_000_000)
+    if HAVE_NUMBA:
+        # 프레임 복사·중간 datetime 컬럼 없이 int64(ns) 배열 한 패스로 합산
+        in_transit_total = _in_transit_kernel(
+            moves["inbound_date"].to_numpy("datetime64[ns]").view("i8"),
+            moves["arrival_date"].to_numpy("datetime64[ns]").view("i8"),
+            qty,
+            in_transit_mask.to_numpy(),
+            np.int64(pd.Timestamp(today).value),
+            np.int64(lag_days) * _day_ns,
+            _day_ns,
+        )
+    else:
+        # 예측 종료일 폴백 — 마스크별 .loc 대입 대신 np.where 체인 한 패스
+        inb = moves["inbound_date"].to_numpy("datetime64[ns]")
+        arr = moves["arrival_date"].to_numpy("datetime64[ns]")
+        today_dt = pd.Timestamp(today).to_datetime64()
+        pred_end = np.where(
+            ~np.isnat(inb), inb,
+            np.where(np.isnat(arr), today_dt + np.timedelta64(1, "D"),
+                     np.where(arr > today_dt, arr,
+                              arr + np.timedelta64(int(lag_days), "D"))),
+        )
+
+        in_transit_total = qty[in_transit_mask.to_numpy() & (today_dt < pred_end)].sum()
     
     # WIP 재고 계산
-    wip_total = moves[
+    wip_mask = (
         (moves["carrier_mode"] == "WIP") &
-        (moves["to_center"].isin(centers_sel)) &
-        (moves["resource_code"].isin(skus_sel))
-    ]["qty_ea"].sum()
-    
+        moves["to_center"].isin(centers_sel) &
+        moves["resource_code"].isin(skus_sel)
+    ).to_numpy()
+    wip_total = qty[wip_mask].sum()
+
+    return {
+        "current_stock": float(current_stock),
+        "in_transit_total": float(in_transit_total),
+        "wip_total": float(wip_total),
+    }
+
+def render_kpis(
+    snap_long: pd.DataFrame,
+    moves: pd.DataFrame,
+    centers_sel: List[str],
+    skus_sel: List[str],
+    latest_dt: pd.Timestamp,
+    today: pd.Timestamp,
+    lag_days: int = 7,
+    latest_snap: Optional[pd.DataFrame] = None
+) -> None:
+    """
+    KPI 카드들을 렌더링합니다.
+
+    계산은 캐시된 _compute_kpis에 위임하고 여기서는 카드만 그립니다.
+
+    Args:
+        snap_long: 정규화된 스냅샷 데이터
+        moves: 이동 데이터
+        centers_sel: 선택된 센터 목록
+        skus_sel: 선택된 SKU 목록
+        latest_dt: 최신 날짜
+        today: 오늘 날짜
+        lag_days: 도착-입고 지연 일수
+        latest_snap: 미리 계산된 최신 날짜 슬라이스 (없으면 내부에서 계산)
+    """
+    if latest_snap is None:
+        latest_snap = _latest_slice(snap_long, latest_dt)
+
+    kpis = _compute_kpis(latest_snap, moves, tuple(centers_sel), tuple(skus_sel),
+                         today, int(lag_days))
+    current_stock = kpis["current_stock"]
+    in_transit_total = kpis["in_transit_total"]
+    wip_total = kpis["wip_total"]
+
     # KPI 카드 렌더링
     col1, col2, col3, col4 = st.columns(4)
     
@@ -105,11 +160,12 @@ def render_center_kpis(
     centers_sel: List[str],
     skus_sel: List[str],
     latest_dt: pd.Timestamp,
-    today: pd.Timestamp
+    today: pd.Timestamp,
+    latest_snap: Optional[pd.DataFrame] = None
 ) -> None:
     """
     센터별 KPI를 렌더링합니다.
-    
+
     Args:
         snap_long: 정규화된 스냅샷 데이터
         moves: 이동 데이터
@@ -117,34 +173,41 @@ def render_center_kpis(
         skus_sel: 선택된 SKU 목록
         latest_dt: 최신 날짜
         today: 오늘 날짜
+        latest_snap: 미리 계산된 최신 날짜 슬라이스 (없으면 내부에서 계산)
     """
     st.subheader("센터별 재고 현황")
-    
-    for center in centers_sel:
-        with st.expander(f"📦 {center}", expanded=False):
-            # 센터별 현재 재고
-            center_stock = snap_long[
-                (snap_long["date"] == latest_dt) &
-                (snap_long["center"] == center) &
-                (snap_long["resource_code"].isin(skus_sel))
-            ]["stock_qty"].sum()
-            
-    # 센터별 이동중 재고
-    center_in_transit_mask = (
-        (moves["to_center"] == center) &
-        (moves["resource_code"].isin(skus_sel)) &
-        (moves["inbound_date"].isna())
+
+    if latest_snap is None:
+        latest_snap = _latest_slice(snap_long, latest_dt)
+
+    # 센터별 현재 재고를 루프 밖에서 한 번에 집계 — 센터마다 전체 프레임을
+    # 다시 스캔하지 않고 Series 조회로 대체
+    center_stock_by = (
+        latest_snap[latest_snap["resource_code"].isin(skus_sel)]
+        .groupby("center", observed=True)["stock_qty"].sum()
+    )
+
+    # 센터별 이동중 재고도 루프 밖에서 한 번에 집계 — 센터마다 moves 전체를
+    # 다시 스캔하지 않고 도착 센터별 합계 Series를 조회
+    transit_mask = (
+        moves["resource_code"].isin(skus_sel) &
+        moves["inbound_date"].isna()
     )
-    
     # onboard_date 컬럼이 있으면 추가 조건 적용
     if "onboard_date" in moves.columns:
-        center_in_transit_mask = center_in_transit_mask & (
-            (moves["onboard_date"].notna()) &
-            (moves["onboard_date"] <= today)
+        transit_mask = transit_mask & (
+            moves["onboard_date"].notna() & (moves["onboard_date"] <= today)
         )
-    
-    center_in_transit = moves[center_in_transit_mask]["qty_ea"].sum()
-            
+    transit_by_center = (
+        moves[transit_mask].groupby("to_center", observed=True)["qty_ea"].sum()
+    )
+
+    for center in centers_sel:
+        with st.expander(f"📦 {center}", expanded=False):
+            # 센터별 현재 재고 / 이동중 재고 — O(1) 조회
+            center_stock = center_stock_by.get(center, 0)
+            center_in_transit = transit_by_center.get(center, 0)
+
             col1, col2 = st.columns(2)
             with col1:
                 st.metric("현재 재고", f"{int(center_stock):,}")
@@ -157,11 +220,12 @@ def render_sku_kpis(
     centers_sel: List[str],
     skus_sel: List[str],
     latest_dt: pd.Timestamp,
-    today: pd.Timestamp
+    today: pd.Timestamp,
+    latest_snap: Optional[pd.DataFrame] = None
 ) -> None:
     """
     SKU별 KPI를 렌더링합니다.
-    
+
     Args:
         snap_long: 정규화된 스냅샷 데이터
         moves: 이동 데이터
@@ -169,20 +233,38 @@ def render_sku_kpis(
         skus_sel: 선택된 SKU 목록
         latest_dt: 최신 날짜
         today: 오늘 날짜
+        latest_snap: 미리 계산된 최신 날짜 슬라이스 (없으면 내부에서 계산)
     """
     st.subheader("SKU별 재고 현황")
-    
+
+    if latest_snap is None:
+        latest_snap = _latest_slice(snap_long, latest_dt)
+
     # SKU별 재고 집계
-    sku_stock = snap_long[
-        (snap_long["date"] == latest_dt) &
-        (snap_long["center"].isin(centers_sel)) &
-        (snap_long["resource_code"].isin(skus_sel))
-    ].groupby("resource_code")["stock_qty"].sum().sort_values(ascending=False)
+    sku_stock = latest_snap[
+        (latest_snap["center"].isin(centers_sel)) &
+        (latest_snap["resource_code"].isin(skus_sel))
+    ].groupby("resource_code", observed=True)["stock_qty"].sum().sort_values(ascending=False)
     
     if not sku_stock.empty:
+        # SKU별 이동중 재고를 루프 밖에서 한 번에 집계 — SKU마다 moves 전체를
+        # 다시 스캔하지 않고 합계 Series를 조회
+        transit_mask = (
+            moves["to_center"].isin(centers_sel) &
+            moves["inbound_date"].isna()
+        )
+        # onboard_date 컬럼이 있으면 추가 조건 적용
+        if "onboard_date" in moves.columns:
+            transit_mask = transit_mask & (
+                moves["onboard_date"].notna() & (moves["onboard_date"] <= today)
+            )
+        transit_by_sku = (
+            moves[transit_mask].groupby("resource_code", observed=True)["qty_ea"].sum()
+        )
+
         # 상위 10개 SKU만 표시
         top_skus = sku_stock.head(10)
-        
+
         for sku, stock in top_skus.items():
             col1, col2, col3 = st.columns([2, 1, 1])
             with col1:
@@ -190,21 +272,6 @@ def render_sku_kpis(
             with col2:
                 st.metric("재고", f"{int(stock):,}")
             with col3:
-                # SKU별 이동중 재고
-                sku_in_transit_mask = (
-                    (moves["resource_code"] == sku) &
-                    (moves["to_center"].isin(centers_sel)) &
-                    (moves["inbound_date"].isna())
-                )
-                
-                # onboard_date 컬럼이 있으면 추가 조건 적용
-                if "onboard_date" in moves.columns:
-                    sku_in_transit_mask = sku_in_transit_mask & (
-                        (moves["onboard_date"].notna()) &
-                        (moves["onboard_date"] <= today)
-                    )
-                
-                sku_in_transit = moves[sku_in_transit_mask]["qty_ea"].sum()
-                st.metric("이동중", f"{int(sku_in_transit):,}")
+                st.metric("이동중", f"{int(transit_by_sku.get(sku, 0)):,}")
     else:
         st.info("선택된 조건에 해당하는 SKU가 없습니다.")
@@ -1,7 +1,20 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from typing import List, Optional
 
+def _isin_codes(series: pd.Series, values: List[str]) -> np.ndarray:
+    """category 컬럼의 멤버십 검사를 정수 코드 비교로 수행합니다.
+
+    isin은 호출마다 조회 리스트를 해싱하지만, category 컬럼이면 카테고리
+    인덱스에서 코드를 한 번 찾은 뒤 np.isin으로 정수 비교만 하면 된다.
+    category가 아닌 컬럼은 일반 isin으로 폴백한다.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(values).to_numpy()
+    codes = series.cat.categories.get_indexer(values)
+    return np.isin(series.cat.codes.to_numpy(), codes[codes >= 0])
+
 def render_upcoming_arrivals(
     moves: pd.DataFrame,
     centers_sel: List[str],
@@ -20,49 +33,57 @@ def render_upcoming_arrivals(
         lag_days: 도착-입고 지연 일수
     """
     st.subheader("입고 예정 내역")
-    
-    # 예측 입고일 계산
-    moves_copy = moves.copy()
-    moves_copy["pred_inbound_date"] = moves_copy["inbound_date"]
-    mask = moves_copy["pred_inbound_date"].isna() & moves_copy["arrival_date"].notna()
-    fut = mask & (moves_copy["arrival_date"] > today)
-    past = mask & (moves_copy["arrival_date"] <= today)
-    
-    moves_copy.loc[fut, "pred_inbound_date"] = moves_copy.loc[fut, "arrival_date"]
-    moves_copy.loc[past, "pred_inbound_date"] = moves_copy.loc[past, "arrival_date"] + pd.Timedelta(days=lag_days)
-    
-    # 입고 예정 데이터 필터링
-    upcoming = moves_copy[
-        (moves_copy["to_center"].isin(centers_sel)) &
-        (moves_copy["resource_code"].isin(skus_sel)) &
-        (moves_copy["pred_inbound_date"].notna()) &
-        (moves_copy["pred_inbound_date"] > today)
-    ].copy()
-    
+
+    # 필터를 먼저 적용하고 생존 행에만 예측 입고일을 계산 —
+    # 전체 프레임 copy + 전행 예측일 계산은 대부분 버려지는 행에 쓰는 비용이다
+    mask = np.logical_and.reduce([
+        _isin_codes(moves["to_center"], centers_sel),
+        _isin_codes(moves["resource_code"], skus_sel),
+        moves["inbound_date"].isna().to_numpy(),
+        moves["arrival_date"].notna().to_numpy(),
+    ])
+
+    display_cols = [
+        "resource_code", "to_center", "qty_ea",
+        "onboard_date", "arrival_date"
+    ]
+    available_cols = [col for col in display_cols if col in moves.columns]
+    upcoming = moves.loc[mask, available_cols]
+
     if upcoming.empty:
         st.info("입고 예정 내역이 없습니다.")
         return
+
+    # 예측 입고일: 미래 도착은 도착일 그대로, 과거 도착은 도착일+lag
+    arr = upcoming["arrival_date"].to_numpy("datetime64[ns]")
+    today64 = np.datetime64(pd.Timestamp(today).to_datetime64())
+    pred = np.where(arr > today64, arr, arr + np.timedelta64(int(lag_days), "D"))
+    upcoming["pred_inbound_date"] = pred
+
+    # 입고 예정(미래)만 남김
+    upcoming_display = upcoming[pred > today64]
+
+    if upcoming_display.empty:
+        st.info("입고 예정 내역이 없습니다.")
+        return
     
-    # 컬럼 선택 및 정리
-    display_cols = [
-        "resource_code", "to_center", "qty_ea", 
-        "onboard_date", "arrival_date", "pred_inbound_date"
-    ]
-    
-    available_cols = [col for col in display_cols if col in upcoming.columns]
-    upcoming_display = upcoming[available_cols].copy()
-    
-    # 날짜 포맷팅
+    # 정렬 (입고예정일 순) — 문자열 비교가 아닌 datetime64 int64 비교로 정렬
+    upcoming_display = upcoming_display.sort_values("pred_inbound_date", kind="mergesort")
+
+    # 입고까지 남은 일수 — 문자열 변환 전에 datetime64 상태에서 계산
+    pred_ns = upcoming_display["pred_inbound_date"].to_numpy("datetime64[ns]")
+    upcoming_display["days_to_inbound"] = (
+        (pred_ns - today64).astype("timedelta64[D]").astype(int)
+    )
+
+    # 날짜 포맷팅 — strftime 대신 datetime64[D] → 문자열 numpy 패스트패스
     date_cols = ["onboard_date", "arrival_date", "pred_inbound_date"]
     for col in date_cols:
         if col in upcoming_display.columns:
-            upcoming_display[col] = pd.to_datetime(upcoming_display[col]).dt.strftime("%Y-%m-%d")
-    
-    # 입고까지 남은 일수 계산
-    if "pred_inbound_date" in upcoming_display.columns:
-        upcoming_display["days_to_inbound"] = (
-            pd.to_datetime(upcoming_display["pred_inbound_date"]) - today
-        ).dt.days
+            d = upcoming_display[col].to_numpy("datetime64[ns]")
+            as_str = d.astype("datetime64[D]").astype(str)
+            as_str[np.isnat(d)] = ""
+            upcoming_display[col] = as_str
     
     # 컬럼명 한글화
     column_mapping = {
@@ -76,18 +97,75 @@ def render_upcoming_arrivals(
     }
     
     upcoming_display = upcoming_display.rename(columns=column_mapping)
-    
-    # 정렬 (입고예정일 순)
-    if "입고예정일" in upcoming_display.columns:
-        upcoming_display = upcoming_display.sort_values("입고예정일")
-    
+
+    # 대형 프레임은 500행 페이지로 잘라 브라우저로 보내는 양을 제한
+    page_size = 500
+    n_pages = (len(upcoming_display) - 1) // page_size + 1
+    if n_pages > 1:
+        page = st.number_input(
+            "페이지", min_value=1, max_value=n_pages, value=1,
+            key="upcoming_arrivals_page",
+            help=f"총 {len(upcoming_display):,}건 / {n_pages}페이지"
+        ) - 1
+        upcoming_display = upcoming_display.iloc[page * page_size:(page + 1) * page_size]
+
     # 테이블 표시
     st.dataframe(
         upcoming_display,
         use_container_width=True,
-        hide_index=True
+        hide_index=True,
+        height=400
+    )
+
+def _frame_fingerprint(df: pd.DataFrame):
+    """캐시 키용 경량 지문 — 전체 프레임 딥해시 대신 (shape, 마지막 날짜).
+
+    로더 캐시가 갱신될 때만 바뀌는 프레임(스냅샷/이동 원본) 전용.
+    모양이 같고 값만 달라질 수 있는 프레임에는 쓰면 안 된다."""
+    last_date = None
+    if "date" in df.columns and len(df):
+        last_date = str(df["date"].iloc[-1])
+    return (df.shape, last_date)
+
+def _timeline_fingerprint(df: pd.DataFrame):
+    """예측 적용 후 타임라인용 지문.
+
+    소진 토글·룩백·이벤트는 모양과 날짜 범위를 그대로 둔 채 값만 바꾸므로
+    stock_qty 합계를 섞어 값 변화도 캐시 키에 반영한다."""
+    qty_sum = round(float(df["stock_qty"].sum()), 3) if "stock_qty" in df.columns else None
+    return (_frame_fingerprint(df), qty_sum)
+
+@st.cache_data(show_spinner=False, max_entries=32,
+               hash_funcs={pd.DataFrame: _frame_fingerprint})
+def _pivot_snapshot(
+    snap_long: pd.DataFrame,
+    centers_sel: tuple,
+    skus_sel: tuple,
+    latest_dt: pd.Timestamp
+) -> Optional[pd.DataFrame]:
+    """최신 스냅샷의 SKU×센터 피벗을 계산합니다 (rerun 간 캐시)."""
+    snapshot = snap_long[
+        (snap_long["date"] == latest_dt).to_numpy() &
+        _isin_codes(snap_long["center"], list(centers_sel)) &
+        _isin_codes(snap_long["resource_code"], list(skus_sel))
+    ]
+
+    if snapshot.empty:
+        return None
+
+    # pivot_table보다 메모리 피크가 낮은 groupby+unstack 경로
+    pivot_table = (
+        snapshot.groupby(["resource_code", "center"], sort=False, observed=True)["stock_qty"]
+        .sum()
+        .unstack("center", fill_value=0)
+        .sort_index()
+        .astype(np.int32)
     )
 
+    # 총합 행 추가
+    pivot_table.loc["총합"] = pivot_table.sum()
+    return pivot_table
+
 def render_inventory_snapshot(
     snap_long: pd.DataFrame,
     centers_sel: List[str],
@@ -96,7 +174,7 @@ def render_inventory_snapshot(
 ) -> None:
     """
     재고 스냅샷 테이블을 렌더링합니다.
-    
+
     Args:
         snap_long: 정규화된 스냅샷 데이터
         centers_sel: 선택된 센터 목록
@@ -104,36 +182,81 @@ def render_inventory_snapshot(
         latest_dt: 최신 날짜
     """
     st.subheader("현재 재고 스냅샷")
-    
-    # 스냅샷 데이터 필터링
-    snapshot = snap_long[
-        (snap_long["date"] == latest_dt) &
-        (snap_long["center"].isin(centers_sel)) &
-        (snap_long["resource_code"].isin(skus_sel))
-    ].copy()
-    
-    if snapshot.empty:
+
+    pivot_table = _pivot_snapshot(snap_long, tuple(centers_sel), tuple(skus_sel), latest_dt)
+
+    if pivot_table is None:
         st.info("재고 스냅샷 데이터가 없습니다.")
         return
-    
-    # 피벗 테이블 생성
-    pivot_table = snapshot.pivot_table(
-        index="resource_code",
-        columns="center",
-        values="stock_qty",
-        fill_value=0,
-        aggfunc="sum"
-    ).astype(int)
-    
-    # 총합 행 추가
-    pivot_table.loc["총합"] = pivot_table.sum()
-    
+
     # 테이블 표시
     st.dataframe(
         pivot_table,
         use_container_width=True
     )
 
+@st.cache_data(show_spinner=False, max_entries=32,
+               hash_funcs={pd.DataFrame: _frame_fingerprint})
+def _pivot_moves_summary(
+    moves: pd.DataFrame,
+    centers_sel: tuple,
+    skus_sel: tuple,
+    start_dt: pd.Timestamp,
+    end_dt: pd.Timestamp
+) -> Optional[pd.DataFrame]:
+    """기간 내 센터별 출고/입고 합계 피벗을 계산합니다 (rerun 간 캐시)."""
+    centers = list(centers_sel)
+
+    # 출발/도착 센터 마스크는 한 번만 만들어 필터와 출고/입고 분리에 재사용
+    from_mask = _isin_codes(moves["from_center"], centers)
+    to_mask = _isin_codes(moves["to_center"], centers)
+
+    # 이동 데이터 필터링
+    combined = (
+        (from_mask | to_mask) &
+        _isin_codes(moves["resource_code"], list(skus_sel)) &
+        moves["onboard_date"].notna().to_numpy() &
+        (moves["onboard_date"] >= start_dt).to_numpy() &
+        (moves["onboard_date"] <= end_dt).to_numpy()
+    )
+    moves_filtered = moves.iloc[np.flatnonzero(combined)]
+
+    if moves_filtered.empty:
+        return None
+
+    # 요약 통계 계산
+    summary_stats = []
+
+    # 출고 통계
+    outbound = moves_filtered[from_mask[combined]]
+    if not outbound.empty:
+        outbound_summary = outbound.groupby("from_center", observed=True)["qty_ea"].sum().reset_index()
+        outbound_summary["type"] = "출고"
+        outbound_summary = outbound_summary.rename(columns={"from_center": "center"})
+        summary_stats.append(outbound_summary)
+
+    # 입고 통계
+    inbound = moves_filtered[to_mask[combined]]
+    if not inbound.empty:
+        inbound_summary = inbound.groupby("to_center", observed=True)["qty_ea"].sum().reset_index()
+        inbound_summary["type"] = "입고"
+        inbound_summary = inbound_summary.rename(columns={"to_center": "center"})
+        summary_stats.append(inbound_summary)
+
+    if not summary_stats:
+        return None
+
+    summary_df = pd.concat(summary_stats, ignore_index=True)
+
+    # pivot_table보다 메모리 피크가 낮은 groupby+unstack 경로
+    return (
+        summary_df.groupby(["center", "type"], sort=False, observed=True)["qty_ea"]
+        .sum()
+        .unstack("type", fill_value=0)
+        .sort_index()
+        .astype(np.int32)
+    )
+
 def render_moves_summary(
     moves: pd.DataFrame,
     centers_sel: List[str],
@@ -152,57 +275,60 @@ def render_moves_summary(
         end_dt: 종료 날짜
     """
     st.subheader("이동 내역 요약")
-    
-    # 이동 데이터 필터링
-    moves_filtered = moves[
-        (moves["from_center"].isin(centers_sel) | moves["to_center"].isin(centers_sel)) &
-        (moves["resource_code"].isin(skus_sel)) &
-        (moves["onboard_date"].notna()) &
-        (moves["onboard_date"] >= start_dt) &
-        (moves["onboard_date"] <= end_dt)
-    ].copy()
-    
-    if moves_filtered.empty:
+
+    pivot_summary = _pivot_moves_summary(moves, tuple(centers_sel), tuple(skus_sel),
+                                         start_dt, end_dt)
+
+    if pivot_summary is None:
         st.info("선택된 기간에 이동 내역이 없습니다.")
         return
-    
-    # 요약 통계 계산
-    summary_stats = []
-    
-    # 출고 통계
-    outbound = moves_filtered[moves_filtered["from_center"].isin(centers_sel)]
-    if not outbound.empty:
-        outbound_summary = outbound.groupby("from_center")["qty_ea"].sum().reset_index()
-        outbound_summary["type"] = "출고"
-        outbound_summary = outbound_summary.rename(columns={"from_center": "center"})
-        summary_stats.append(outbound_summary)
-    
-    # 입고 통계
-    inbound = moves_filtered[moves_filtered["to_center"].isin(centers_sel)]
-    if not inbound.empty:
-        inbound_summary = inbound.groupby("to_center")["qty_ea"].sum().reset_index()
-        inbound_summary["type"] = "입고"
-        inbound_summary = inbound_summary.rename(columns={"to_center": "center"})
-        summary_stats.append(inbound_summary)
-    
-    if summary_stats:
-        summary_df = pd.concat(summary_stats, ignore_index=True)
-        
-        # 피벗 테이블 생성
-        pivot_summary = summary_df.pivot_table(
-            index="center",
-            columns="type",
-            values="qty_ea",
-            fill_value=0
-        ).astype(int)
-        
-        # 테이블 표시
-        st.dataframe(
-            pivot_summary,
-            use_container_width=True
-        )
-    else:
-        st.info("요약할 데이터가 없습니다.")
+
+    # 테이블 표시
+    st.dataframe(
+        pivot_summary,
+        use_container_width=True
+    )
+
+@st.cache_data(show_spinner=False, max_entries=32,
+               hash_funcs={pd.DataFrame: _timeline_fingerprint})
+def _pivot_sku_details(
+    timeline_df: pd.DataFrame,
+    sku: str,
+    start_dt: pd.Timestamp,
+    end_dt: pd.Timestamp
+) -> Optional[pd.DataFrame]:
+    """단일 SKU의 날짜×센터 피벗을 계산합니다 (rerun 간 캐시)."""
+    sku_data = timeline_df[
+        (timeline_df["resource_code"] == sku) &
+        (timeline_df["date"] >= start_dt) &
+        (timeline_df["date"] <= end_dt)
+    ]
+
+    if sku_data.empty:
+        return None
+
+    # 단일 SKU는 밀집 (일수 × 센터) int32 행렬을 직접 채우는 편이
+    # groupby/unstack보다 빠르고 할당도 훨씬 적다
+    day_ns = 86_400_000_000_000
+    start_ns = pd.Timestamp(start_dt).normalize().value
+    end_ns = pd.Timestamp(end_dt).normalize().value
+    dates = np.arange(start_ns, end_ns + 1, day_ns).view("datetime64[ns]")
+
+    centers = np.sort(sku_data["center"].unique())
+    col_of = {center: i for i, center in enumerate(centers)}
+    rows = np.searchsorted(dates, sku_data["date"].to_numpy("datetime64[ns]"))
+    cols = np.fromiter((col_of[c] for c in sku_data["center"]),
+                       dtype=np.intp, count=len(sku_data))
+
+    matrix = np.zeros((len(dates), len(centers)), dtype=np.int32)
+    np.add.at(matrix, (rows, cols), sku_data["stock_qty"].to_numpy(np.int32))
+
+    # 날짜 포맷팅 — datetime64[D] → 문자열 numpy 패스트패스
+    return pd.DataFrame(
+        matrix,
+        index=pd.Index(dates.astype("datetime64[D]").astype(str)),
+        columns=list(centers),
+    )
 
 def render_sku_details(
     timeline_df: pd.DataFrame,
@@ -212,7 +338,7 @@ def render_sku_details(
 ) -> None:
     """
     특정 SKU의 상세 정보 테이블을 렌더링합니다.
-    
+
     Args:
         timeline_df: 타임라인 DataFrame
         sku: SKU 코드
@@ -220,29 +346,13 @@ def render_sku_details(
         end_dt: 종료 날짜
     """
     st.subheader(f"SKU {sku} 상세 정보")
-    
-    # SKU 데이터 필터링
-    sku_data = timeline_df[
-        (timeline_df["resource_code"] == sku) &
-        (timeline_df["date"] >= start_dt) &
-        (timeline_df["date"] <= end_dt)
-    ].copy()
-    
-    if sku_data.empty:
+
+    pivot_data = _pivot_sku_details(timeline_df, sku, start_dt, end_dt)
+
+    if pivot_data is None:
         st.info(f"SKU '{sku}'에 대한 데이터가 없습니다.")
         return
-    
-    # 피벗 테이블 생성
-    pivot_data = sku_data.pivot_table(
-        index="date",
-        columns="center",
-        values="stock_qty",
-        fill_value=0
-    ).astype(int)
-    
-    # 날짜 포맷팅
-    pivot_data.index = pivot_data.index.strftime("%Y-%m-%d")
-    
+
     # 테이블 표시
     st.dataframe(
         pivot_data,
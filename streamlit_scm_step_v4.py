@@ -2,14 +2,22 @@
 import pandas as pd
 import numpy as np
 import streamlit as st
-import plotly.express as px
 import re
+import time
 from datetime import datetime, timedelta
 from io import BytesIO
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import gspread
 from google.oauth2.service_account import Credentials
 
+# joblib은 선택 의존성 — 없으면 순차 경로로 동작
+try:
+    from joblib import Parallel, delayed
+    HAVE_JOBLIB = True
+except ImportError:
+    HAVE_JOBLIB = False
+
 # =========================
 # Global configuration
 # =========================
@@ -38,6 +46,15 @@ CENTER_COL = {
     "어크로스비US": "acrossb_available_stock",  # 별칭 통일
 }
 
+# 센터명 별칭 통일 / 제외 규칙
+CENTER_ALIAS = {"AcrossBUS": "어크로스비US"}
+CENTER_DROP = frozenset({"", "nan", "None", "WIP", "In-Transit"})
+
+def normalize_centers(s: pd.Series) -> pd.Series:
+    """센터명 Series를 벡터화로 정규화: 제외 대상은 NaN, 별칭은 대표 이름으로 치환."""
+    s = s.astype(str)
+    return s.where(~s.isin(CENTER_DROP)).replace(CENTER_ALIAS)
+
 # -------------------- Small helpers --------------------
 def _coalesce_columns(df: pd.DataFrame, candidates: List, parse_date: bool = False) -> pd.Series:
     """
@@ -69,6 +86,60 @@ def _coalesce_columns(df: pd.DataFrame, candidates: List, parse_date: bool = Fal
     return out
 
 
+# Google Sheets 프레임의 디스크 캐시(Parquet) — 메모리 캐시와 달리 프로세스 재시작에도 살아남음
+_GSHEET_DISK_DIR = Path("/tmp/scm_cache")
+_GSHEET_DISK_TTL = 300  # 초 단위, 상단 st.cache_data ttl과 동일하게 유지
+
+def _read_gsheet_disk_cache():
+    """TTL 이내의 Parquet 캐시가 있으면 (move, ref, incoming) 튜플 반환, 없으면 None."""
+    try:
+        paths = [_GSHEET_DISK_DIR / f"{GSHEET_ID}_{n}.parquet" for n in ("move", "ref", "incoming")]
+        if all(p.exists() for p in paths) and \
+                time.time() - min(p.stat().st_mtime for p in paths) < _GSHEET_DISK_TTL:
+            try:
+                # pandas 2.x면 Arrow 백엔드로 읽음 — 문자열 연산이 C++ 커널로 처리되고 메모리도 절감
+                return tuple(pd.read_parquet(p, dtype_backend="pyarrow") for p in paths)
+            except TypeError:  # 구버전 pandas는 dtype_backend 미지원
+                return tuple(pd.read_parquet(p) for p in paths)
+    except Exception:
+        pass  # pyarrow 미설치/파일 손상 등은 조용히 무시하고 네트워크 경로로
+    return None
+
+def _read_snap_raw_disk_cache():
+    """TTL 이내의 snapshot_raw Parquet이 있으면 DataFrame, 없으면 None."""
+    try:
+        p = _GSHEET_DISK_DIR / f"{GSHEET_ID}_snap_raw.parquet"
+        if p.exists() and time.time() - p.stat().st_mtime < _GSHEET_DISK_TTL:
+            try:
+                return pd.read_parquet(p, dtype_backend="pyarrow")
+            except TypeError:  # 구버전 pandas는 dtype_backend 미지원
+                return pd.read_parquet(p)
+    except Exception:
+        pass
+    return None
+
+def _write_gsheet_disk_cache(df_move, df_ref, df_incoming, df_snap_raw=None):
+    try:
+        _GSHEET_DISK_DIR.mkdir(parents=True, exist_ok=True)
+        for n, df in (("move", df_move), ("ref", df_ref), ("incoming", df_incoming)):
+            df.to_parquet(_GSHEET_DISK_DIR / f"{GSHEET_ID}_{n}.parquet", compression="snappy")
+        # snapshot_raw(선택)도 함께 보존 — 디스크 히트로 기동한 세션에서
+        # 로트 상세가 조용히 사라지지 않도록
+        snap_raw_path = _GSHEET_DISK_DIR / f"{GSHEET_ID}_snap_raw.parquet"
+        if df_snap_raw is not None and not df_snap_raw.empty:
+            df_snap_raw.to_parquet(snap_raw_path, compression="snappy")
+        else:
+            snap_raw_path.unlink(missing_ok=True)  # 빈 결과면 이전 파일이 되살아나지 않게
+    except Exception:
+        pass  # 디스크 캐시는 베스트에포트
+
+# 서비스 계정 자격 증명은 거의 바뀌지 않으므로 TTL 만료 후 재파싱하지 않도록 메모이즈
+@st.cache_resource
+def _parse_credentials(creds_json: str, scopes: Tuple[str, ...]):
+    import json
+    from google.oauth2.service_account import Credentials
+    return Credentials.from_service_account_info(json.loads(creds_json), scopes=list(scopes))
+
 # -------------------- Google Sheets (API authentication) loader --------------------
 @st.cache_data(ttl=300)
 def load_from_gsheet_api():
@@ -76,6 +147,14 @@ def load_from_gsheet_api():
     from google.oauth2.service_account import Credentials
     import gspread
 
+    # 디스크(Parquet) 티어 먼저 확인 — 워커 재시작 직후에도 네트워크 왕복 없이 기동
+    cached = _read_gsheet_disk_cache()
+    if cached is not None:
+        # 히트 경로에서도 로트 상세용 snapshot_raw 세션 키를 복원
+        if st.session_state.get("_snapshot_raw_cache") is None:
+            st.session_state["_snapshot_raw_cache"] = _read_snap_raw_disk_cache()
+        return cached
+
     scopes = [
         "https://www.googleapis.com/auth/spreadsheets.readonly",
         "https://www.googleapis.com/auth/drive.readonly",
@@ -92,12 +171,8 @@ def load_from_gsheet_api():
     creds_json = gs.get("credentials_json", None)
 
     if creds_obj is not None:
-        # 중첩/인라인 테이블
-        if isinstance(creds_obj, dict):
-            credentials_info = dict(creds_obj)
-        else:
-            # Streamlit Secrets 객체 → dict
-            credentials_info = {k: creds_obj[k] for k in creds_obj.keys()}
+        # 중첩/인라인 테이블 및 Streamlit Secrets 객체 모두 dict(...)로 한 번에 변환
+        credentials_info = dict(creds_obj)
     elif creds_json:
         # 멀티라인 JSON 문자열
         credentials_info = json.loads(str(creds_json))
@@ -110,7 +185,7 @@ def load_from_gsheet_api():
         credentials_info["private_key"] = credentials_info["private_key"].replace("\\n", "\n").strip()
 
     try:
-        credentials = Credentials.from_service_account_info(credentials_info, scopes=scopes)
+        credentials = _parse_credentials(json.dumps(credentials_info, sort_keys=True), tuple(scopes))
         gc = gspread.authorize(credentials)
         ss = gc.open_by_key(GSHEET_ID)
     except Exception as e:
@@ -126,10 +201,27 @@ def load_from_gsheet_api():
             st.warning(f"{name} 시트를 읽을 수 없습니다: {e}")
             return pd.DataFrame()
 
-    # 기존 3개 시트
-    df_move = _read("SCM_통합")
-    df_ref = _read("snap_정제")
-    df_incoming = _read("입고예정내역")
+    def _frame(rows):
+        # batchGet 결과(values 2차원 리스트) → DataFrame. 행 길이가 들쭉날쭉하면 헤더 길이에 맞춰 패딩
+        if not rows or len(rows) < 2:
+            return pd.DataFrame()
+        header = [str(c).strip() for c in rows[0]]
+        body = [r + [""] * (len(header) - len(r)) if len(r) < len(header) else r[:len(header)]
+                for r in rows[1:]]
+        return pd.DataFrame(body, columns=header)
+
+    # 기존 3개 시트: HTTP 왕복 3회 대신 values.batchGet 1회로 묶어서 읽기
+    _sheet_names = ["SCM_통합", "snap_정제", "입고예정내역"]
+    try:
+        res = ss.values_batch_get([f"'{n}'!A:ZZ" for n in _sheet_names])
+        df_move, df_ref, df_incoming = (
+            _frame(vr.get("values", [])) for vr in res["valueRanges"]
+        )
+    except Exception:
+        # batchGet 미지원/실패 시 기존 개별 읽기로 폴백
+        df_move = _read("SCM_통합")
+        df_ref = _read("snap_정제")
+        df_incoming = _read("입고예정내역")
 
     # 🔹 snapshot_raw(선택)도 시도해서 읽고, 읽히면 세션 캐시에 저장
     try:
@@ -150,6 +242,8 @@ def load_from_gsheet_api():
         # 없거나 권한 없으면 조용히 패스 (로트 상세는 자동으로 미표시)
         st.session_state["_snapshot_raw_cache"] = None
 
+    _write_gsheet_disk_cache(df_move, df_ref, df_incoming,
+                             st.session_state.get("_snapshot_raw_cache"))
     return df_move, df_ref, df_incoming
 
 # -------------------- Loaders --------------------
@@ -278,6 +372,46 @@ def normalize_moves(df: pd.DataFrame) -> pd.DataFrame:
     out["event_date"] = out["inbound_date"].where(out["inbound_date"].notna(), out["arrival_date"])
     return out
 
+# -------------------- Cached normalizers --------------------
+# 위젯 조작으로 인한 rerun마다 원본 DF를 다시 파싱하지 않도록 정규화 결과를 캐시
+@st.cache_data(ttl=300)
+def _normalize_moves_cached(df_move: pd.DataFrame) -> pd.DataFrame:
+    moves = normalize_moves(df_move)
+    # 저카디널리티 문자열은 category로 캐스팅 → isin/groupby/==가 정수 코드 연산이 됨
+    for c in ("from_center", "to_center", "carrier_mode", "resource_code"):
+        moves[c] = moves[c].astype("category")
+    return moves
+
+@st.cache_data(ttl=300)
+def _normalize_snap_cached(df_ref: pd.DataFrame) -> pd.DataFrame:
+    snap = normalize_refined_snapshot(df_ref)
+    for c in ("center", "resource_code"):
+        snap[c] = snap[c].astype("category")
+    # int64 '일 번호' 파생 키 (build_timeline 출력의 day 컬럼과 동일 규약)
+    snap["day"] = snap["date"].values.astype("datetime64[D]").view("int64")
+    return snap
+
+@st.cache_data(ttl=300)
+def _load_wip_cached(df_incoming: Optional[pd.DataFrame]) -> pd.DataFrame:
+    return load_wip_from_incoming(df_incoming)
+
+@st.cache_data(ttl=300)
+def _latest_snapshot_slice(snap_long: pd.DataFrame) -> pd.DataFrame:
+    """최신 스냅샷 날짜의 행만 잘라 캐시 — 앵커 계산이 전체 snap_long 대신 이 슬라이스만 훑게 함."""
+    return snap_long[snap_long["date"] == snap_long["date"].max()]
+
+@st.cache_data(ttl=300)
+def _filter_universe(snap_long: pd.DataFrame, moves: pd.DataFrame) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """필터 위젯용 (센터, SKU) 목록 — 데이터가 갱신될 때만 unique/정렬을 다시 수행."""
+    center_values = pd.unique(np.concatenate([
+        snap_long["center"].dropna().astype(str).to_numpy(),
+        moves["from_center"].dropna().astype(str).to_numpy(),
+        moves["to_center"].dropna().astype(str).to_numpy(),
+    ]))
+    centers = tuple(sorted(normalize_centers(pd.Series(center_values)).dropna().unique()))
+    skus = tuple(sorted(snap_long["resource_code"].dropna().astype(str).unique()))
+    return centers, skus
+
 # PO 번호 → 날짜 파싱
 def _parse_po_date(po_str: str) -> pd.Timestamp:
     if not isinstance(po_str, str):
@@ -338,9 +472,22 @@ def merge_wip_as_moves(moves_df: pd.DataFrame, wip_df: Optional[pd.DataFrame]) -
     return pd.concat([moves_df, wip_moves], ignore_index=True)
 
 # -------------------- 소비(소진) 추세 + 이벤트 가중치 --------------------
-@st.cache_data(ttl=3600)
+def _cheap_df_hash(df: pd.DataFrame):
+    """캐시 키용 저비용 DataFrame 해시.
+
+    (모양, 컬럼, 날짜 범위)에 더해 stock_qty 합계를 섞는다 — 타임라인은
+    lag_days 같은 위젯 입력에 따라 모양은 같고 값만 달라질 수 있어,
+    값 성분 없이는 슬라이더 변경 후에도 이전 예측이 캐시에서 서빙된다.
+    합계 한 번은 전체 내용을 해싱하는 비용(수백 ms)보다 훨씬 싸다."""
+    dc = "date" if "date" in df.columns else ("snapshot_date" if "snapshot_date" in df.columns else None)
+    qty_sum = round(float(df["stock_qty"].sum()), 3) if "stock_qty" in df.columns else None
+    if dc is None:
+        return (df.shape, tuple(df.columns), qty_sum)
+    return (df.shape, tuple(df.columns), str(df[dc].min()), str(df[dc].max()), qty_sum)
+
+@st.cache_data(ttl=3600, hash_funcs={pd.DataFrame: _cheap_df_hash})
 def estimate_daily_consumption(snap_long: pd.DataFrame,
-                               centers_sel: List[str], skus_sel: List[str],
+                               centers_sel: Tuple[str, ...], skus_sel: Tuple[str, ...],
                                asof_dt: pd.Timestamp,
                                lookback_days: int = 28) -> Dict[Tuple[str, str], float]:
     snap = snap_long.rename(columns={"snapshot_date":"date"}).copy()
@@ -355,7 +502,7 @@ def estimate_daily_consumption(snap_long: pd.DataFrame,
     if hist.empty:
         return rates
 
-    for (ct, sku), g in hist.groupby(["center","resource_code"]):
+    for (ct, sku), g in hist.groupby(["center","resource_code"], observed=True):
         ts = (g.sort_values("date")
                 .set_index("date")["stock_qty"]
                 .asfreq("D").ffill())
@@ -371,14 +518,16 @@ def estimate_daily_consumption(snap_long: pd.DataFrame,
             rates[(ct, sku)] = float(rate)
     return rates
 
-@st.cache_data(ttl=1800)
+# cache_data는 히트마다 pickle 왕복을 수행하므로, 대용량 타임라인은 cache_resource로 보관.
+# 반환 객체는 세션 간 공유되므로 호출부는 읽기 전용으로 다뤄야 함(수정 시 merge/copy로 새 프레임 생성).
+@st.cache_resource(ttl=1800, hash_funcs={pd.DataFrame: _cheap_df_hash})
 def apply_consumption_with_events(
     timeline: pd.DataFrame,
     snap_long: pd.DataFrame,
-    centers_sel: List[str], skus_sel: List[str],
+    centers_sel: Tuple[str, ...], skus_sel: Tuple[str, ...],
     start_dt: pd.Timestamp, end_dt: pd.Timestamp,
     lookback_days: int = 28,
-    events: Optional[List[Dict]] = None
+    events: Optional[Tuple[Tuple[str, str, float], ...]] = None
 ) -> pd.DataFrame:
     out = timeline.copy()
     if out.empty:
@@ -403,10 +552,10 @@ def apply_consumption_with_events(
     idx = pd.date_range(cons_start, end_dt, freq="D")
     uplift = pd.Series(1.0, index=idx)
     if events:
-        for e in events:
-            s = pd.to_datetime(e.get("start"), errors="coerce")
-            t = pd.to_datetime(e.get("end"), errors="coerce")
-            u = min(3.0, max(-1.0, float(e.get("uplift", 0.0))))
+        for ev_s, ev_t, ev_u in events:
+            s = pd.to_datetime(ev_s, errors="coerce")
+            t = pd.to_datetime(ev_t, errors="coerce")
+            u = min(3.0, max(-1.0, float(ev_u)))
             if pd.notna(s) and pd.notna(t):
                 s = s.normalize(); t = t.normalize()
                 s = max(s, idx[0]); t = min(t, idx[-1])
@@ -467,6 +616,16 @@ def build_timeline(snap_long: pd.DataFrame, moves: pd.DataFrame,
     # 이동건 복사
     mv_all = moves.copy()
 
+    # 예측 입고일을 전체 이동건에 대해 한 번만 벡터화 계산 (루프 밖으로 호이스팅)
+    # 규칙: inbound 있으면 그 날 / arrival이 미래면 arrival / 과거면 arrival+N일
+    _inb = mv_all["inbound_date"].to_numpy("datetime64[ns]")
+    _arr = mv_all["arrival_date"].to_numpy("datetime64[ns]")
+    mv_all["pred_inbound_date"] = np.where(
+        ~np.isnat(_inb), _inb,
+        np.where(_arr > np.datetime64(today), _arr,
+                 _arr + np.timedelta64(int(lag_days), "D")),
+    )
+
     base = snap_long[
         snap_long["center"].isin(centers_sel) &
         snap_long["resource_code"].isin(skus_sel)
@@ -477,8 +636,14 @@ def build_timeline(snap_long: pd.DataFrame, moves: pd.DataFrame,
 
     lines = []
 
-    # 1) 실제 센터 라인
-    for (ct, sku), grp in base.groupby(["center","resource_code"]):
+    # (sku, 센터)별 행 위치를 루프 밖에서 한 번에 인덱싱 — 루프 안의
+    # astype(str) 전수 비교를 O(1) dict 조회 + 위치 gather로 대체
+    from_idx = mv_all.groupby(["resource_code", "from_center"], sort=False, observed=True).indices
+    to_idx = mv_all.groupby(["resource_code", "to_center"], sort=False, observed=True).indices
+    _no_rows = np.array([], dtype=np.intp)
+
+    # 1) 실제 센터 라인 — 쌍별 작업은 서로 독립이라 병렬화 가능
+    def _build_pair_line(ct, sku, grp):
         grp = grp.sort_values("date")
         last_dt = grp["date"].max()
 
@@ -493,43 +658,21 @@ def build_timeline(snap_long: pd.DataFrame, moves: pd.DataFrame,
         ts = ts.sort_values("date")
         ts["stock_qty"] = ts["stock_qty"].ffill()
 
-        mv = mv_all[mv_all["resource_code"] == sku].copy()
+        mv_from = mv_all.iloc[from_idx.get((sku, ct), _no_rows)]
+        mv_to = mv_all.iloc[to_idx.get((sku, ct), _no_rows)]
 
         # 출고(-) 이벤트
         eff_minus = (
-            mv[(mv["from_center"].astype(str) == str(ct)) &
-               (mv["onboard_date"].notna()) &
-               (mv["onboard_date"] > last_dt)]
+            mv_from[(mv_from["onboard_date"].notna()) &
+                    (mv_from["onboard_date"] > last_dt)]
             .groupby("onboard_date", as_index=False)["qty_ea"].sum()
             .rename(columns={"onboard_date":"date","qty_ea":"delta"})
         )
         eff_minus["delta"] *= -1
 
-        # 입고(+) 이벤트 (예측 입고일 계산)
-        mv_center = mv[(mv["to_center"].astype(str) == str(ct))].copy()
+        # 입고(+) 이벤트 — 예측 입고일은 루프 밖에서 일괄 계산돼 있음
+        mv_center = mv_to
         if not mv_center.empty:
-            # 예측 입고일 계산 (이동중 종료일과 동일한 로직)
-            pred_inbound = pd.Series(pd.NaT, index=mv_center.index, dtype="datetime64[ns]")
-            
-            # 1) inbound가 있으면 그 날 입고
-            mask_inb = mv_center["inbound_date"].notna()
-            pred_inbound.loc[mask_inb] = mv_center.loc[mask_inb, "inbound_date"]
-            
-            # 2) inbound 없고 arrival 있는 경우
-            mask_arr = (~mask_inb) & mv_center["arrival_date"].notna()
-            if mask_arr.any():
-                # 2-1) arrival이 과거면: arrival + N일에 입고(가정)
-                past_arr = mask_arr & (mv_center["arrival_date"] <= today)
-                pred_inbound.loc[past_arr] = (
-                    mv_center.loc[past_arr, "arrival_date"] + pd.Timedelta(days=int(lag_days))
-                )
-                
-                # 2-2) arrival이 미래면: arrival에 입고
-                fut_arr = mask_arr & (mv_center["arrival_date"] > today)
-                pred_inbound.loc[fut_arr] = mv_center.loc[fut_arr, "arrival_date"]
-            
-            mv_center["pred_inbound_date"] = pred_inbound
-            
             eff_plus = (
                 mv_center[(mv_center["pred_inbound_date"].notna()) &
                           (mv_center["pred_inbound_date"] > last_dt)]
@@ -552,14 +695,11 @@ def build_timeline(snap_long: pd.DataFrame, moves: pd.DataFrame,
                     ts.loc[ts["date"] >= date, "stock_qty"] = ts.loc[ts["date"] >= date, "stock_qty"] + delta
 
         ts["stock_qty"] = ts["stock_qty"].fillna(0).replace([np.inf, -np.inf], 0).clip(lower=0)
-        lines.append(ts)
 
         # (보강) WIP 완료 물량을 해당 도착 센터 라인에 반영
-        wip_complete = moves[
-            (moves["resource_code"] == sku) &
-            (moves["carrier_mode"].astype(str).str.upper() == "WIP") &
-            (moves["to_center"] == ct) &
-            (moves["event_date"].notna())
+        wip_complete = mv_to[
+            (mv_to["carrier_mode"].astype(str).str.upper() == "WIP") &
+            (mv_to["event_date"].notna())
         ].copy()
         if not wip_complete.empty:
             wip_add = (
@@ -574,7 +714,21 @@ def build_timeline(snap_long: pd.DataFrame, moves: pd.DataFrame,
                 if delta != 0:
                     ts.loc[ts["date"] >= date, "stock_qty"] = ts.loc[ts["date"] >= date, "stock_qty"] + delta
             ts["stock_qty"] = ts["stock_qty"].fillna(0).replace([np.inf, -np.inf], 0).clip(lower=0)
-            lines[-1] = ts  # 갱신
+
+        # 쌍마다 작은 DataFrame을 쌓지 않고 (날짜, 센터, SKU, 재고) 배열 튜플로만 모은다
+        return (ts["date"].to_numpy(), ct, sku, ts["stock_qty"].to_numpy())
+
+    pair_groups = base.groupby(["center","resource_code"], observed=True)
+    if HAVE_JOBLIB and len(skus_sel) >= 8:
+        # 프로세스 백엔드는 Streamlit 스크립트를 통째로 다시 실행하므로 스레드만 사용.
+        # pandas/numpy C 루틴이 GIL을 풀어 스레드로도 코어를 활용할 수 있다.
+        # 게이트(SKU 8개 이상)는 풀 가동 비용을 상쇄할 만큼 일이 있을 때만 병렬화.
+        lines.extend(Parallel(n_jobs=-1, prefer="threads")(
+            delayed(_build_pair_line)(ct, sku, grp) for (ct, sku), grp in pair_groups
+        ))
+    else:
+        for (ct, sku), grp in pair_groups:
+            lines.append(_build_pair_line(ct, sku, grp))
 
     # 2) In-Transit & WIP 가상 라인
     moves_str = mv_all.copy()
@@ -589,7 +743,7 @@ def build_timeline(snap_long: pd.DataFrame, moves: pd.DataFrame,
          (moves_str["carrier_mode"] == "WIP"))
     ]
 
-    for sku, g in mv_sel.groupby("resource_code"):
+    for sku, g in mv_sel.groupby("resource_code", observed=True):
         # --- Non-WIP In-Transit (벡터화) ----
         g_nonwip = g[g["carrier_mode"] != "WIP"]
         if not g_nonwip.empty:
@@ -598,28 +752,11 @@ def build_timeline(snap_long: pd.DataFrame, moves: pd.DataFrame,
                 idx = pd.date_range(start_dt, horizon_end, freq="D")
                 today_norm = (today or pd.Timestamp.today()).normalize()
 
-                # 종료일 계산: inbound(있으면) / arrival(미래면) / 그 외 today+1
-                end_eff = pd.Series(pd.NaT, index=g_selected.index, dtype="datetime64[ns]")
-
-                # 1) inbound가 있으면 그 날 종료
-                mask_inb = g_selected["inbound_date"].notna()
-                end_eff.loc[mask_inb] = g_selected.loc[mask_inb, "inbound_date"]
-
-                # 2) inbound 없고 arrival 있는 경우
-                mask_arr = (~mask_inb) & g_selected["arrival_date"].notna()
-                if mask_arr.any():
-                    # 2-1) arrival이 과거면: arrival + N일에 종료(가정)
-                    past_arr = mask_arr & (g_selected["arrival_date"] <= today_norm)
-                    end_eff.loc[past_arr] = (
-                        g_selected.loc[past_arr, "arrival_date"] + pd.Timedelta(days=int(lag_days))
-                    )
-
-                    # 2-2) arrival이 미래면: arrival에 종료
-                    fut_arr = mask_arr & (g_selected["arrival_date"] > today_norm)
-                    end_eff.loc[fut_arr] = g_selected.loc[fut_arr, "arrival_date"]
-
-                # 3) 그래도 비어있으면: today+1 (화면상 오늘까지만 이동중으로 보이도록)
-                end_eff = end_eff.fillna(min(today_norm + pd.Timedelta(days=1), idx[-1] + pd.Timedelta(days=1)))
+                # 종료일 = 루프 밖에서 계산한 예측 입고일,
+                # 비어있으면 today+1 (화면상 오늘까지만 이동중으로 보이도록)
+                end_eff = g_selected["pred_inbound_date"].fillna(
+                    min(today_norm + pd.Timedelta(days=1), idx[-1] + pd.Timedelta(days=1))
+                )
 
                 # starts/ends 델타 만들어 누적합
                 g_selected_with_end = g_selected.copy()
@@ -648,10 +785,7 @@ def build_timeline(snap_long: pd.DataFrame, moves: pd.DataFrame,
                     s = (s + carry).clip(lower=0)
 
                 if s.any():
-                    lines.append(pd.DataFrame({
-                        "date": s.index, "center": "In-Transit",
-                        "resource_code": sku, "stock_qty": s.values.astype(int)
-                    }))
+                    lines.append((s.index.to_numpy(), "In-Transit", sku, s.values.astype(int)))
 
         # --- WIP ---
         g_wip = g[g["carrier_mode"] == "WIP"]
@@ -682,15 +816,21 @@ def build_timeline(snap_long: pd.DataFrame, moves: pd.DataFrame,
                     if delta != 0:
                         s.loc[s.index >= date] = s.loc[s.index >= date] + delta
                 
-                vdf = pd.DataFrame({"date": s.index, "center": "WIP",
-                                    "resource_code": sku, "stock_qty": s.values})
-                vdf["stock_qty"] = vdf["stock_qty"].fillna(0).replace([np.inf, -np.inf], 0).clip(lower=0)
-                lines.append(vdf)
+                vals = np.nan_to_num(s.values.astype(float), nan=0.0,
+                                     posinf=0.0, neginf=0.0).clip(min=0)
+                lines.append((s.index.to_numpy(), "WIP", sku, vals))
 
     if not lines:
         return pd.DataFrame(columns=["date","center","resource_code","stock_qty"])
 
-    out = pd.concat(lines, ignore_index=True)
+    # 배열을 이어붙여 최종 프레임을 한 번에 생성 (라인 수만큼의 concat 제거)
+    seg_lens = [len(d) for d, _, _, _ in lines]
+    out = pd.DataFrame({
+        "date": pd.DatetimeIndex(np.concatenate([d for d, _, _, _ in lines])),
+        "center": np.repeat(np.array([c for _, c, _, _ in lines], dtype=object), seg_lens),
+        "resource_code": np.repeat(np.array([k for _, _, k, _ in lines], dtype=object), seg_lens),
+        "stock_qty": np.concatenate([np.asarray(v, dtype=float) for _, _, _, v in lines]),
+    })
     out = out[(out["date"] >= start_dt) & (out["date"] <= horizon_end)]
     
     # 최종 NaN 처리
@@ -698,7 +838,10 @@ def build_timeline(snap_long: pd.DataFrame, moves: pd.DataFrame,
     out["stock_qty"] = out["stock_qty"].fillna(0)
     out["stock_qty"] = out["stock_qty"].replace([np.inf, -np.inf], 0)
     out["stock_qty"] = out["stock_qty"].clip(lower=0).astype(int)
-    
+
+    # int64 '일 번호' 파생 키 — 날짜 비교/병합을 단순 정수 연산으로 처리하기 위함
+    out["day"] = out["date"].values.astype("datetime64[D]").view("int64")
+
     return out
 
 # -------------------- 비용(재고자산) 피벗 --------------------
@@ -761,11 +904,11 @@ with tab1:
         st.session_state["_data_source"] = "excel"
         st.session_state["_snapshot_raw_cache"] = snap_raw_df  # snapshot_raw 있으면 저장
 
-        moves_raw = normalize_moves(df_move)
-        snap_long = normalize_refined_snapshot(df_ref)
+        moves_raw = _normalize_moves_cached(df_move)
+        snap_long = _normalize_snap_cached(df_ref)
 
         try:
-            wip_df = load_wip_from_incoming(df_incoming)
+            wip_df = _load_wip_cached(df_incoming)
             moves = merge_wip_as_moves(moves_raw, wip_df)
             st.success(f"WIP {len(wip_df)}건 반영 완료" if wip_df is not None and not wip_df.empty else "WIP 없음")
         except Exception as e:
@@ -787,10 +930,10 @@ with tab2:
             
             st.session_state["_data_source"] = "gsheet"
 
-            moves_raw = normalize_moves(df_move)
-            snap_long = normalize_refined_snapshot(df_ref)
+            moves_raw = _normalize_moves_cached(df_move)
+            snap_long = _normalize_snap_cached(df_ref)
             try:
-                wip_df = load_wip_from_incoming(df_incoming)
+                wip_df = _load_wip_cached(df_incoming)
                 moves = merge_wip_as_moves(moves_raw, wip_df)
                 st.success(f"✅ Google Sheets 로드 완료! WIP {len(wip_df)}건 반영" if wip_df is not None and not wip_df.empty else "✅ Google Sheets 로드 완료! WIP 없음")
             except Exception as e:
@@ -806,10 +949,10 @@ if "snap_long" not in locals():
         df_move, df_ref, df_incoming = load_from_gsheet_api()
         if not df_move.empty and not df_ref.empty:
             st.session_state["_data_source"] = "gsheet"
-            moves = normalize_moves(df_move)
-            snap_long = normalize_refined_snapshot(df_ref)
+            moves = _normalize_moves_cached(df_move)
+            snap_long = _normalize_snap_cached(df_ref)
             try:
-                wip_df = load_wip_from_incoming(df_incoming)
+                wip_df = _load_wip_cached(df_incoming)
                 moves = merge_wip_as_moves(moves, wip_df)
             except Exception:
                 pass
@@ -822,25 +965,8 @@ if "snap_long" not in locals():
         st.stop()
 
 # -------------------- Filters --------------------
-centers_snap = set(snap_long["center"].dropna().astype(str).unique().tolist())
-centers_moves = set(moves["from_center"].dropna().astype(str).unique().tolist() + 
-                   moves["to_center"].dropna().astype(str).unique().tolist())
-
-def normalize_center_name(center):
-    if center in ["", "nan", "None", "WIP", "In-Transit"]:
-        return None
-    if center in ["AcrossBUS", "어크로스비US"]:
-        return "어크로스비US"
-    return center
-
-all_centers = set()
-for center in centers_snap | centers_moves:
-    normalized = normalize_center_name(center)
-    if normalized:
-        all_centers.add(normalized)
-
-centers = sorted(list(all_centers))
-skus = sorted(snap_long["resource_code"].dropna().astype(str).unique().tolist())
+# 세 컬럼의 unique/정렬은 데이터가 바뀔 때만 수행 (캐시된 헬퍼)
+centers, skus = _filter_universe(snap_long, moves)
 
 today = pd.Timestamp.today().normalize()
 PAST_DAYS = 42
@@ -877,52 +1003,65 @@ def _clamp_range(r):
 
 _init_range()
 
-st.sidebar.header("필터")
-centers_sel = st.sidebar.multiselect("센터 선택", centers, default=(["태광KR"] if "태광KR" in centers else centers[:1]))
-skus_sel = st.sidebar.multiselect("SKU 선택", skus, default=([s for s in ["BA00022","BA00021"] if s in skus] or skus[:2]))
-
-st.sidebar.subheader("기간 설정")
-st.sidebar.number_input("미래 전망 일수", min_value=0, max_value=FUTURE_DAYS, step=1,
-                        key="horizon_days", on_change=_apply_horizon_to_range)
-
-date_range = st.sidebar.date_input("기간",
-    value=(_clamp_range(st.session_state.date_range)[0].date(), 
-           _clamp_range(st.session_state.date_range)[1].date()),
-    min_value=bound_min.date(),
-    max_value=bound_max.date(),
-    format="YYYY-MM-DD")
+# 위젯 하나 바꿀 때마다 전체 파이프라인이 rerun되지 않도록 필터를 form으로 묶음
+# (form 내부 위젯은 '적용' 제출 전까지 rerun을 일으키지 않음)
+with st.sidebar.form("filters"):
+    st.header("필터")
+    centers_sel = st.multiselect("센터 선택", centers, default=(["태광KR"] if "태광KR" in centers else centers[:1]))
+    skus_sel = st.multiselect("SKU 선택", skus, default=([s for s in ["BA00022","BA00021"] if s in skus] or skus[:2]))
+
+    st.subheader("기간 설정")
+    st.number_input("미래 전망 일수", min_value=0, max_value=FUTURE_DAYS, step=1,
+                    key="horizon_days")
+
+    date_range = st.date_input("기간",
+        value=(_clamp_range(st.session_state.date_range)[0].date(),
+               _clamp_range(st.session_state.date_range)[1].date()),
+        min_value=bound_min.date(),
+        max_value=bound_max.date(),
+        format="YYYY-MM-DD")
+
+    st.header("표시 옵션")
+    show_prod = st.checkbox("생산중(미완료) 표시", value=True)
+    show_transit = st.checkbox("이동중 표시", value=True)
+    use_cons_forecast = st.checkbox("추세 기반 재고 예측", value=True)
+    lookback_days = st.number_input("추세 계산 기간(일)", min_value=7, max_value=56, value=28, step=7)
+
+    # 입고 반영 가정 옵션
+    st.subheader("입고 반영 가정")
+    lag_days = st.number_input("입고 반영 리드타임(일) – inbound 미기록 시 arrival+N",
+                               min_value=0, max_value=21, value=7, step=1)
+
+    with st.expander("프로모션 가중치(+%)", expanded=False):
+        enable_event = st.checkbox("가중치 적용", value=False)
+        ev_start = st.date_input("시작일")
+        ev_end   = st.date_input("종료일")
+        ev_pct   = st.number_input("가중치(%)", min_value=-100.0, max_value=300.0, value=30.0, step=5.0)
+
+    submitted = st.form_submit_button("적용")
+
+# form 안에서는 on_change 콜백을 쓸 수 없으므로 제출 시점에 전망 일수 변경을 기간에 반영
+if submitted and int(st.session_state.horizon_days) != st.session_state.get("_applied_horizon"):
+    _apply_horizon_to_range()
+    date_range = st.session_state.date_range
+if submitted:
+    st.session_state["_applied_horizon"] = int(st.session_state.horizon_days)
 
 start_dt = pd.Timestamp(date_range[0]).normalize()
 end_dt   = pd.Timestamp(date_range[1]).normalize()
-_latest_snap = snap_long["date"].max()
+_latest_snap = snap_max  # 위에서 한 번 구한 최신 스냅샷 날짜 재사용 (O(N) 스캔 반복 방지)
 proj_days_for_build = max(0, int((end_dt - _latest_snap).days))
-
-st.sidebar.header("표시 옵션")
-show_prod = st.sidebar.checkbox("생산중(미완료) 표시", value=True)
-show_transit = st.sidebar.checkbox("이동중 표시", value=True)
-use_cons_forecast = st.sidebar.checkbox("추세 기반 재고 예측", value=True)
-lookback_days = st.sidebar.number_input("추세 계산 기간(일)", min_value=7, max_value=56, value=28, step=7)
-
-# 입고 반영 가정 옵션
-st.sidebar.subheader("입고 반영 가정")
-lag_days = st.sidebar.number_input("입고 반영 리드타임(일) – inbound 미기록 시 arrival+N", 
-                                   min_value=0, max_value=21, value=7, step=1)
-
-with st.sidebar.expander("프로모션 가중치(+%)", expanded=False):
-    enable_event = st.checkbox("가중치 적용", value=False)
-    ev_start = st.date_input("시작일")
-    ev_end   = st.date_input("종료일")
-    ev_pct   = st.number_input("가중치(%)", min_value=-100.0, max_value=300.0, value=30.0, step=5.0)
-events = [{"start": pd.Timestamp(ev_start).strftime("%Y-%m-%d"),
-           "end":   pd.Timestamp(ev_end).strftime("%Y-%m-%d"),
-           "uplift": ev_pct/100.0}] if enable_event else []
+# 캐시 키로 쓰이므로 해시 가능한 튜플-of-튜플 형태로 유지
+events = ((pd.Timestamp(ev_start).strftime("%Y-%m-%d"),
+           pd.Timestamp(ev_end).strftime("%Y-%m-%d"),
+           ev_pct/100.0),) if enable_event else ()
 
 # -------------------- KPIs (SKU별 분해) --------------------
 st.subheader("요약 KPI")
 
 # 스냅샷 날짜 컬럼 이름 호환('date' 또는 'snapshot_date')
 _snap_date_col = "date" if "date" in snap_long.columns else "snapshot_date"
-_latest_dt = pd.to_datetime(snap_long[_snap_date_col]).max().normalize()
+_latest_dt = snap_max  # 동일 값 — 필터 섹션에서 이미 계산됨
 _latest_dt_str = _latest_dt.strftime("%Y-%m-%d")
 
 # 품명 매핑(선택)
@@ -950,7 +1089,7 @@ def _kpi_breakdown_per_sku(snap_long, mv, centers_sel, skus_sel, today):
         (snap_long[_snap_date_col] == _latest_dt) &
         (snap_long["center"].isin(centers_sel)) &
         (snap_long["resource_code"].astype(str).isin(skus_sel))
-    ].groupby("resource_code", as_index=True)["stock_qty"].sum())
+    ].groupby("resource_code", as_index=True, observed=True)["stock_qty"].sum())
 
     # 이동중: 예측 종료일 기준으로 오늘 이후까지 이동중인 건만
     mv_kpi = mv.copy()
@@ -986,7 +1125,7 @@ def _kpi_breakdown_per_sku(snap_long, mv, centers_sel, skus_sel, today):
         (mv_kpi["onboard_date"].notna()) &
         (mv_kpi["onboard_date"] <= today) &
         (today < mv_kpi["pred_end_date"])  # 오늘 이후까지 이동중인 건만
-    ].groupby("resource_code", as_index=True)["qty_ea"].sum())
+    ].groupby("resource_code", as_index=True, observed=True)["qty_ea"].sum())
 
     # WIP: SKU×날짜별 (onboard +, event -) 누적합을 오늘까지 계산한 잔량
     w = mv[
@@ -1051,29 +1190,39 @@ timeline = build_timeline(snap_long, moves, centers_sel, skus_sel,
 
 if use_cons_forecast and not timeline.empty:
     timeline = apply_consumption_with_events(
-        timeline, snap_long, centers_sel, skus_sel,
+        timeline, snap_long, tuple(centers_sel), tuple(skus_sel),
         start_dt, end_dt, lookback_days=int(lookback_days), events=events
     )
 
 # 오늘 앵커: 차트의 '오늘' 값을 스냅샷 값으로 고정
 today_norm = pd.Timestamp.today().normalize()
-latest_dt = snap_long["date"].max()
-anchor_base = (snap_long[
-    (snap_long["date"] == latest_dt) &
-    (snap_long["center"].isin(centers_sel)) &
-    (snap_long["resource_code"].isin(skus_sel))
-].groupby(["center","resource_code"])["stock_qty"].sum())
-
-for (ct, sku), y in anchor_base.items():
-    m = ((timeline["center"] == ct) &
-         (timeline["resource_code"] == sku) &
-         (timeline["date"] == today_norm))
-    timeline.loc[m, "stock_qty"] = int(y)
+_latest_slice = _latest_snapshot_slice(snap_long)
+anchor_base = (_latest_slice[
+    _latest_slice["center"].isin(centers_sel) &
+    _latest_slice["resource_code"].isin(skus_sel)
+].groupby(["center","resource_code"], observed=True)["stock_qty"].sum())
+
+# 머지/마스크 없이 (center, sku, day) 인덱스 정렬 기반 update로 오늘 값을 덮어씀
+_today_day = today_norm.to_datetime64().astype("datetime64[D]").astype("int64")
+if not anchor_base.empty and not timeline.empty:
+    anchor_series = anchor_base.astype(int)
+    anchor_series.index = pd.MultiIndex.from_arrays(
+        [anchor_series.index.get_level_values(0).astype(str),
+         anchor_series.index.get_level_values(1).astype(str),
+         np.full(len(anchor_series), _today_day)],
+        names=["center", "resource_code", "day"])
+    tl = timeline.set_index(["center", "resource_code", "day"], drop=False)
+    _stock = tl["stock_qty"].copy()
+    _stock.update(anchor_series)
+    tl["stock_qty"] = _stock
+    timeline = tl.reset_index(drop=True)
 
 if timeline.empty:
     st.info("선택 조건에 해당하는 타임라인 데이터가 없습니다.")
 else:
-    vis_df = timeline[(timeline["date"] >= start_dt) & (timeline["date"] <= end_dt)].copy()
+    _start_day = start_dt.to_datetime64().astype("datetime64[D]").astype("int64")
+    _end_day = end_dt.to_datetime64().astype("datetime64[D]").astype("int64")
+    vis_df = timeline[(timeline["day"] >= _start_day) & (timeline["day"] <= _end_day)].copy()
     vis_df["center"] = vis_df["center"].str.replace(r"^In-Transit.*$", "이동중", regex=True)
     vis_df.loc[vis_df["center"] == "WIP", "center"] = "생산중"
     if "태광KR" not in centers_sel:
@@ -1087,6 +1236,8 @@ else:
     vis_df = vis_df[vis_df["stock_qty"] > 0]
     vis_df["label"] = vis_df["resource_code"] + " @ " + vis_df["center"]
 
+    import plotly.express as px  # 차트를 실제로 그릴 때만 import (cold start 수백 ms 절감)
+
     fig = px.line(vis_df, x="date", y="stock_qty", color="label", line_shape="hv",
                   title="선택한 SKU × 센터(및 이동중/생산중) 계단식 재고 흐름", render_mode="svg")
     fig.update_layout(hovermode="x unified", xaxis_title="날짜", yaxis_title="재고량(EA)",
@@ -1224,7 +1375,7 @@ else:
 st.subheader(f"선택 센터 현재 재고 (스냅샷 {_latest_dt_str} / 전체 SKU)")
 
 cur = snap_long[(snap_long["date"] == _latest_dt) & (snap_long["center"].isin(centers_sel))].copy()
-pivot = (cur.groupby(["resource_code","center"], as_index=False)["stock_qty"].sum()
+pivot = (cur.groupby(["resource_code","center"], as_index=False, observed=True)["stock_qty"].sum()
            .pivot(index="resource_code", columns="center", values="stock_qty").fillna(0).astype(int))
 pivot["총합"] = pivot.sum(axis=1)
 
@@ -1298,7 +1449,7 @@ if len(visible_skus) == 1:
     # lot 상세 테이블 만들기
     if snap_raw_df is None or snap_raw_df.empty:
         # _latest_dt_str를 여기서 계산
-        latest_dt_str = pd.to_datetime(snap_long["date"]).max().strftime("%Y-%m-%d")
+        latest_dt_str = _latest_dt_str
         st.markdown(f"### 로트 상세 (스냅샷 {latest_dt_str} / **{', '.join(centers_sel)}** / **{lot_sku}**)")
         st.caption("해당 조건의 로트 상세가 없습니다. (snapshot_raw 없음)")
     else:
@@ -1326,7 +1477,7 @@ if len(visible_skus) == 1:
                 out["합계"] = out[used_centers].sum(axis=1)
                 out = out[out["합계"] > 0]
                 # _latest_dt_str를 여기서 계산
-                latest_dt_str = pd.to_datetime(snap_long["date"]).max().strftime("%Y-%m-%d")
+                latest_dt_str = _latest_dt_str
                 st.markdown(f"### 로트 상세 (스냅샷 {latest_dt_str} / **{', '.join(centers_sel)}** / **{lot_sku}**)")
                 if out.empty:
                     st.caption("해당 조건의 로트 상세가 없습니다.")
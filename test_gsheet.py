@@ -4,6 +4,13 @@ from urllib.parse import quote
 
 GSHEET_ID = "1RYjKW2UDJ2kWJLAqQH26eqx2-r9Xb0_qE_hfwu9WIj8"
 
+# 다운스트림에서 쓰는 컬럼의 dtype 선언 — C 파서의 타입 추론 스캔을 생략
+_CSV_DTYPES = {
+    "resource_code": "category",
+    "center": "category",
+    "stock_qty": "int32",
+}
+
 def test_gsheet_csv():
     """Google Sheets CSV 다운로드 테스트"""
     try:
@@ -14,16 +21,26 @@ def test_gsheet_csv():
         print(f"CSV 다운로드 URL: {url}")
         print("Google Sheets CSV 다운로드 중...")
         
+        # 다운로드는 한 번만 — 인코딩 시도마다 네트워크 왕복을 반복하지 않음
+        response = requests.get(url, headers={"Accept-Encoding": "gzip"}, timeout=30)
+        response.raise_for_status()
+
         # 여러 인코딩 시도
         for encoding in ['utf-8', 'cp949', 'latin-1']:
             try:
                 print(f"인코딩 {encoding} 시도 중...")
-                response = requests.get(url)
-                response.raise_for_status()
-                
-                # CSV 데이터를 DataFrame으로 읽기
-                from io import StringIO
-                df = pd.read_csv(StringIO(response.text), encoding=encoding)
+                # 원시 바이트를 pandas C 파서에 바로 넘겨 디코드+파싱을 한 패스로 —
+                # response.text는 전체 본문을 str로 먼저 디코드하는 복사가 생긴다
+                from io import BytesIO
+                # 헤더 행만 먼저 읽어 실제 존재하는 컬럼에만 dtype 힌트 적용
+                header_cols = pd.read_csv(BytesIO(response.content), nrows=0,
+                                          encoding=encoding, engine='c').columns
+                dtype_hints = {col: t for col, t in _CSV_DTYPES.items()
+                               if col in header_cols}
+                date_cols = ["date"] if "date" in header_cols else []
+                df = pd.read_csv(BytesIO(response.content), encoding=encoding,
+                                 engine='c', dtype=dtype_hints,
+                                 parse_dates=date_cols, date_format="%Y-%m-%d")
                 
                 if not df.empty:
                     print(f"성공! {len(df)}개 행을 찾았습니다.")
@@ -56,7 +73,8 @@ def test_public_access():
         public_url = f"https://docs.google.com/spreadsheets/d/{GSHEET_ID}/edit"
         print(f"공개 URL 테스트: {public_url}")
         
-        response = requests.get(public_url)
+        # 상태 코드만 필요하므로 HTML 본문 전체를 받지 않는 HEAD 요청 사용
+        response = requests.head(public_url, allow_redirects=True, timeout=5)
         print(f"공개 URL 응답 코드: {response.status_code}")
         
         if response.status_code == 200: